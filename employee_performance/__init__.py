@@ -1 +1,8 @@
-from . import models
\ No newline at end of file
+from . import controllers
+from . import models
+from . import wizard
+
+
+def post_init_hook(env):
+    """Link the KPI lines of existing records to their performance lines"""
+    env['employee.kpi.line']._link_all_performance_lines()
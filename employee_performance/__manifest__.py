@@ -1,18 +1,27 @@
 {
     "name": "Track Performance",
-    "version": "1.0.0",
+    "version": "1.0.1",
     "summary": "Employee performance, KPI, hierarchy observation, bottom-up aggregation (Odoo 19)",
     "category": "Human Resources",
     "author": "yours",
     "depends": ["hr", "hr_org_chart", "mail", "web"],
     "data": [
         "security/ir.model.access.csv",
+        "data/ir_cron_data.xml",
         "views/dashboard_view.xml", 
         "views/performance_views.xml",     
         "views/config_views.xml",
         "views/employee_extension_views.xml",
         "views/kpi_views.xml",
         "views/hierarchy_views.xml",
+        "views/counter_import_views.xml",
+        "views/aggregation_job_views.xml",
+        "views/review_cycle_views.xml",
+        "views/appraisal_export_views.xml",
+        "views/bulk_run_views.xml",
+        "views/analytics_views.xml",
+        "views/telemetry_views.xml",
+        "wizard/review_cycle_wizard_views.xml",
         "views/menu.xml",
     ],
     "assets": {
@@ -20,6 +29,7 @@
             "employee_performance/static/src/js/employee_performance_dashboard.js"
         ]
     },
+    "post_init_hook": "post_init_hook",
     "installable": True,
     "application": True,
     "license": "LGPL-3"
@@ -0,0 +1,44 @@
+import gzip
+import json
+
+from odoo import http
+from odoo.exceptions import AccessError, UserError
+from odoo.http import request
+from odoo.tools import json_default
+
+MAX_PAGE_SIZE = 10000
+
+
+class PerformanceBiApiController(http.Controller):
+
+    @http.route('/employee_performance/api/<string:dataset>', type='http', auth='bearer', methods=['GET'])
+    def bi_dataset(self, dataset, fields=None, cursor=None, limit=1000):
+        """One page of a dataset as NDJSON, gzip'd when the client accepts it.
+
+        fields: comma-separated projection; cursor: the X-Next-Cursor value
+        of the previous page ("<write_date>,<id>"). X-Has-More is 0 on the
+        last page; its cursor is kept to pull only later changes next time.
+        """
+        try:
+            limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+            if cursor:
+                write_date, last_id = cursor.rsplit(',', 1)
+                cursor = (write_date, int(last_id))
+            fnames = [fname.strip() for fname in fields.split(',') if fname.strip()] if fields else None
+            rows, next_cursor = request.env['performance.bi.api']._fetch_page(dataset, fnames, cursor, limit)
+        except AccessError as e:
+            return request.make_json_response({'error': str(e)}, status=403)
+        except (UserError, ValueError) as e:
+            return request.make_json_response({'error': str(e)}, status=400)
+
+        body = ''.join(json.dumps(row, default=json_default) + '\n' for row in rows).encode('utf-8')
+        headers = [
+            ('Content-Type', 'application/x-ndjson'),
+            ('X-Next-Cursor', '%s,%s' % next_cursor if next_cursor else ''),
+            ('X-Has-More', '1' if len(rows) == limit else '0'),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        if 'gzip' in request.httprequest.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=6)
+            headers.append(('Content-Encoding', 'gzip'))
+        return request.make_response(body, headers=headers)
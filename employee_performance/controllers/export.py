@@ -0,0 +1,56 @@
+from werkzeug.exceptions import BadRequest
+
+from odoo import api, http
+from odoo.http import request, content_disposition
+from odoo.modules.registry import Registry
+
+from ..models.appraisal_export import EXPORT_KINDS
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class AppraisalExportController(http.Controller):
+
+    @http.route('/employee_performance/export/<string:kind>/<string:file_format>', type='http', auth='user')
+    def export_appraisals(self, kind, file_format, selection=None, ids=None, page_size=1000):
+        """Stream every appraisal of kind (performance or kpi) with its lines as CSV or XLSX.
+
+        selection: id of a stored performance.appraisal.export.selection, as
+        set by the list actions; ids: comma-separated record ids, for short
+        hand-written links. Without either, everything is exported.
+        """
+        if kind not in EXPORT_KINDS or file_format not in CONTENT_TYPES:
+            raise request.not_found()
+        try:
+            page_size = max(int(page_size), 1)
+            if selection:
+                record_ids = request.env['performance.appraisal.export.selection']._get_record_ids(int(selection), kind)
+            elif ids:
+                record_ids = [int(record_id) for record_id in ids.split(',')]
+            else:
+                record_ids = None
+        except ValueError as e:
+            raise BadRequest(str(e))
+        domain = [('id', 'in', record_ids)] if record_ids is not None else []
+        # Check access now: the generator runs after the request's cursor is gone
+        request.env[EXPORT_KINDS[kind][0]].check_access('read')
+
+        headers = [
+            ('Content-Type', CONTENT_TYPES[file_format]),
+            ('Content-Disposition', content_disposition(f'{kind}_appraisals.{file_format}')),
+        ]
+        rows = self._stream(request.env.cr.dbname, request.env.uid, dict(request.env.context),
+                            kind, file_format, domain, page_size)
+        return request.make_response(rows, headers=headers)
+
+    @staticmethod
+    def _stream(dbname, uid, context, kind, file_format, domain, page_size):
+        """Produce the file on its own read-only cursor while the response is being sent"""
+        with Registry(dbname).cursor(readonly=True) as cr:
+            env = api.Environment(cr, uid, context)
+            Export = env['performance.appraisal.export']
+            stream = Export.stream_csv if file_format == 'csv' else Export.stream_xlsx
+            yield from stream(kind, domain, page_size)
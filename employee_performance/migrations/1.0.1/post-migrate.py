@@ -0,0 +1,8 @@
+from odoo import api, SUPERUSER_ID
+
+
+def migrate(cr, version):
+    # KPI lines created before they were linked to performance lines, and
+    # supervisors' lines linked before the aggregation owned their value
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['employee.kpi.line']._link_all_performance_lines()
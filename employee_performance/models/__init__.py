@@ -1,4 +1,15 @@
+from . import telemetry
+from . import bulk_run
+from . import dashboard
+from . import aggregation
+from . import aggregation_job
 from . import hr_employee
 from . import config
 from . import performance
-from . import kpi
\ No newline at end of file
+from . import kpi
+from . import review_cycle
+from . import analytics
+from . import index_audit
+from . import counter_import
+from . import appraisal_export
+from . import bi_api
\ No newline at end of file
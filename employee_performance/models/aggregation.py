@@ -0,0 +1,436 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+from odoo.tools import str2bool
+
+from .telemetry import add_touched_records
+
+
+class PerformanceAggregation(models.AbstractModel):
+    _name = 'performance.aggregation'
+    _description = 'Bottom-up Performance Aggregation'
+
+    # Aggregated model -> (line model, field linking the line to its record)
+    _line_models = {
+        'employee.performance': ('employee.performance.line', 'performance_id'),
+        'employee.kpi': ('employee.kpi.line', 'kpi_id'),
+    }
+
+    @api.model
+    def _is_incremental(self):
+        """Whether line changes are propagated to the ancestors as they happen"""
+        param = self.env['ir.config_parameter'].sudo().get_param('employee_performance.incremental_rollup')
+        return str2bool(param or '0')
+
+    @api.model
+    def _load_hierarchy(self, employees, recursive=True):
+        """Load the org below employees.
+
+        Returns the levels (top first, each a list of employee ids) and a
+        mapping of supervisor id -> direct subordinate ids. The whole subtree
+        is fetched with one prefix search on parent_path; when recursive is
+        False only the direct subordinates are loaded.
+        """
+        Employee = self.env['hr.employee']
+        children = defaultdict(list)
+        if recursive:
+            subordinates = Employee.search_fetch([('id', 'child_of', employees.ids)], ['parent_id'])
+        else:
+            subordinates = Employee.search_fetch([('parent_id', 'in', employees.ids)], ['parent_id'])
+        roots = set(employees.ids)
+        for sub in subordinates:
+            if sub.id not in roots:
+                children[sub.parent_id.id].append(sub.id)
+
+        # Walk the loaded tree in memory to split it by depth
+        levels = [list(employees.ids)]
+        seen = set(roots)
+        frontier = employees.ids
+        while frontier:
+            frontier = [sub_id for emp_id in frontier for sub_id in children.get(emp_id, ()) if sub_id not in seen]
+            seen.update(frontier)
+            if frontier:
+                levels.append(frontier)
+            if not recursive:
+                break
+        return levels, children
+
+    @api.model
+    def _aggregate(self, model_name, levels, children, records=None, propagate=True):
+        """Roll up line achievements of model_name in a single post-order pass.
+
+        Every record and line of the loaded hierarchy is read once, averages
+        are computed in memory from the deepest level up, and the results are
+        written back grouped by value. When records is given, only those
+        records are updated; the rest of the tree is only read. With
+        incremental rollup and propagate, the changes of the top level are
+        then pushed to the supervisors above it.
+        """
+        line_model, link = self._line_models[model_name]
+        Record = self.env[model_name]
+        Line = self.env[line_model]
+
+        employee_ids = [emp_id for level in levels for emp_id in level]
+        all_records = Record.search_fetch([('employee_id', 'in', employee_ids)], ['employee_id'])
+        targets = records if records is not None else all_records
+        writable = set(targets.ids)
+        employee_of = {rec.id: rec.employee_id.id for rec in all_records}
+
+        lines = Line.search_fetch(
+            [(link, 'in', all_records.ids)],
+            [link, 'objective_id', 'achieved_percentage'],
+        )
+        add_touched_records(len(all_records) + len(lines))
+        original = {}
+        lines_by_employee = defaultdict(list)
+        for line in lines:
+            record_id = line[link].id
+            original[line.id] = line.achieved_percentage
+            lines_by_employee[employee_of[record_id]].append((line.id, line.objective_id.id, record_id))
+
+        values = dict(original)
+        aggregated_employees = set()
+        subtree_totals = {}
+        for level in reversed(levels):
+            for emp_id in level:
+                subordinates = children.get(emp_id)
+                if not subordinates:
+                    continue
+                aggregated_employees.add(emp_id)
+
+                # Sum and count the positive achievements of direct subordinates
+                totals = defaultdict(lambda: [0.0, 0])
+                for sub_id in subordinates:
+                    for line_id, objective_id, _record_id in lines_by_employee.get(sub_id, ()):
+                        if values[line_id] > 0:
+                            total = totals[objective_id]
+                            total[0] += values[line_id]
+                            total[1] += 1
+
+                for line_id, objective_id, record_id in lines_by_employee.get(emp_id, ()):
+                    if record_id in writable and objective_id in totals:
+                        total, count = totals[objective_id]
+                        values[line_id] = round(total / count, 2)
+                subtree_totals[emp_id] = totals
+
+        # Batched write-back: one UPDATE per distinct value. The engine already
+        # handled the subtree, so the incremental hook must not replay it.
+        line_ids_by_value = defaultdict(list)
+        for line_id, value in values.items():
+            if value != original[line_id]:
+                line_ids_by_value[value].append(line_id)
+        Line = Line.with_context(skip_rollup_propagation=True)
+        for value, line_ids in line_ids_by_value.items():
+            Line.browse(line_ids).write({'achieved_percentage': value})
+
+        if self._is_incremental():
+            self.env['performance.aggregation.node']._store_totals(model_name, subtree_totals)
+            if propagate:
+                # The supervisors above the loaded tree still count the top level's previous values
+                before, after = {}, {}
+                for emp_id in levels[0]:
+                    for line_id, objective_id, _record_id in lines_by_employee.get(emp_id, ()):
+                        if values[line_id] != original[line_id]:
+                            before[line_id] = (emp_id, objective_id, original[line_id])
+                            after[line_id] = (emp_id, objective_id, values[line_id])
+                self._propagate(model_name, before, after)
+
+        # One grouped state write; bulk runs post a single summary instead of tracking each record
+        checked = targets.filtered(lambda rec: employee_of[rec.id] in aggregated_employees)
+        if checked:
+            if self.env.context.get('performance_bulk_mode'):
+                checked = checked.with_context(tracking_disable=True)
+            checked.write({'state': 'checked'})
+        return checked
+
+    @api.model
+    def aggregate_subtree(self, employees, propagate=True):
+        """Aggregate performance and KPI records of the whole org below employees.
+
+        Returns the number of records marked as checked.
+        """
+        levels, children = self._load_hierarchy(employees)
+        return sum(len(self._aggregate(model_name, levels, children, propagate=propagate))
+                   for model_name in self._line_models)
+
+    @api.model
+    def _get_parallel_workers(self):
+        """Partitions aggregation jobs split the org into, processed concurrently; 0 or 1 meaning serial"""
+        return int(self.env['ir.config_parameter'].sudo().get_param('employee_performance.aggregation_workers', 0))
+
+    @api.model
+    def _partition(self, levels, children, partitions):
+        """Split the org into disjoint subtrees, balanced into at most partitions buckets.
+
+        Returns the levels above the split, which are merged afterwards, and
+        the buckets of subtree root ids.
+        """
+        # Go down until there are enough independent subtrees to share out
+        split = 1
+        while split < len(levels) - 1 and len(levels[split]) < partitions * 4:
+            split += 1
+
+        sizes = {}
+        for level in reversed(levels[split:]):
+            for emp_id in level:
+                sizes[emp_id] = 1 + sum(sizes.get(sub_id, 0) for sub_id in children.get(emp_id, ()))
+
+        # Largest subtrees first, each to the least loaded bucket
+        buckets = [[0, []] for _i in range(min(partitions, len(levels[split])))]
+        for emp_id in sorted(levels[split], key=sizes.get, reverse=True):
+            bucket = min(buckets, key=lambda bucket: bucket[0])
+            bucket[0] += sizes[emp_id]
+            bucket[1].append(emp_id)
+        return levels[:split], [emp_ids for _size, emp_ids in buckets if emp_ids]
+
+    @api.model
+    def aggregate_employees(self, employees, propagate=True):
+        """Aggregate performance and KPI records of employees from their direct subordinates only.
+
+        Returns the number of records marked as checked.
+        """
+        levels, children = self._load_hierarchy(employees, recursive=False)
+        return sum(len(self._aggregate(model_name, levels, children, propagate=propagate))
+                   for model_name in self._line_models)
+
+    @api.model
+    def subtree_achievement(self, employees, model_name='employee.performance'):
+        """Average positive line achievement per objective across each employee's whole subtree.
+
+        Returns {employee id: {objective id: {'average', 'count'}}}, with one
+        grouped query per employee matching the subtree on its parent_path
+        prefix, regardless of depth.
+        """
+        line_model, link = self._line_models[model_name]
+        Line = self.env[line_model]
+        result = {}
+        for employee in employees:
+            groups = Line._read_group([
+                (f'{link}.employee_id.parent_path', '=like', f'{employee.parent_path}%'),
+                (f'{link}.employee_id', '!=', employee.id),
+                ('achieved_percentage', '>', 0),
+            ], ['objective_id'], ['achieved_percentage:avg', '__count'])
+            result[employee.id] = {
+                objective.id: {'average': round(average, 2), 'count': count}
+                for objective, average, count in groups
+            }
+        return result
+
+    @api.model
+    def aggregate_records(self, records):
+        """Aggregate the given performance or KPI records from their direct subordinates"""
+        levels, children = self._load_hierarchy(records.employee_id, recursive=False)
+        return self._aggregate(records._name, levels, children, records=records)
+
+    @api.model
+    def _propagate(self, model_name, before, after):
+        """Push line achievement changes to the supervisors' lines, one level at a time.
+
+        before and after map line ids to (employee id, objective id, achieved)
+        tuples. Only the touched (supervisor, objective) totals are adjusted;
+        writing the supervisors' lines re-enters this method for the next
+        level up, so a change costs O(depth).
+        """
+        changes = []
+        for line_id in before.keys() | after.keys():
+            old, new = before.get(line_id), after.get(line_id)
+            if old and new and old[:2] == new[:2]:
+                if old[2] != new[2]:
+                    changes.append((new[0], new[1], old[2], new[2]))
+                continue
+            if old and old[2]:
+                changes.append((old[0], old[1], old[2], 0.0))
+            if new and new[2]:
+                changes.append((new[0], new[1], 0.0, new[2]))
+        if not changes:
+            return
+
+        employees = self.env['hr.employee'].browse(list({change[0] for change in changes}))
+        supervisor_of = {emp.id: emp.parent_id.id for emp in employees}
+        deltas = defaultdict(lambda: [0.0, 0])
+        for emp_id, objective_id, old, new in changes:
+            supervisor_id = supervisor_of.get(emp_id)
+            if not supervisor_id:
+                continue
+            delta = deltas[(supervisor_id, objective_id)]
+            delta[0] += (new if new > 0 else 0.0) - (old if old > 0 else 0.0)
+            delta[1] += (new > 0) - (old > 0)
+        if not deltas:
+            return
+
+        totals = self.env['performance.aggregation.node']._apply_deltas(model_name, deltas)
+
+        line_model, link = self._line_models[model_name]
+        supervisor_lines = self.env[line_model].search_fetch([
+            (f'{link}.employee_id', 'in', list({key[0] for key in totals})),
+            ('objective_id', 'in', list({key[1] for key in totals})),
+        ], [link, 'objective_id', 'achieved_percentage'])
+        line_ids_by_value = defaultdict(list)
+        for line in supervisor_lines:
+            total, count = totals.get((line[link].employee_id.id, line.objective_id.id), (0.0, 0))
+            if count:
+                value = round(total / count, 2)
+                if value != line.achieved_percentage:
+                    line_ids_by_value[value].append(line.id)
+        for value, line_ids in line_ids_by_value.items():
+            self.env[line_model].browse(line_ids).write({'achieved_percentage': value})
+
+
+class PerformanceAggregationNode(models.Model):
+    _name = 'performance.aggregation.node'
+    _description = 'Subordinate Achievement Totals'
+
+    res_model = fields.Selection([
+        ('employee.performance', 'Performance'),
+        ('employee.kpi', 'KPI'),
+    ], string='Model', required=True)
+    employee_id = fields.Many2one('hr.employee', string='Supervisor', required=True, index=True, ondelete='cascade')
+    objective_id = fields.Many2one('performance.objective', string='Objective', required=True, ondelete='cascade')
+    total = fields.Float(string='Total Achieved')
+    count = fields.Integer(string='Contributing Lines')
+
+    @api.model
+    def _store_totals(self, model_name, totals_by_employee):
+        """Replace the cached totals of the given supervisors with freshly computed ones"""
+        Node = self.sudo()
+        Node.search([
+            ('res_model', '=', model_name),
+            ('employee_id', 'in', list(totals_by_employee)),
+        ]).unlink()
+        Node.create([{
+            'res_model': model_name,
+            'employee_id': emp_id,
+            'objective_id': objective_id,
+            'total': total,
+            'count': count,
+        } for emp_id, totals in totals_by_employee.items() for objective_id, (total, count) in totals.items()])
+
+    @api.model
+    def _apply_deltas(self, model_name, deltas):
+        """Adjust cached totals by deltas and return (total, count) per (supervisor, objective).
+
+        Missing (dirty) nodes are rebuilt from the subordinates' current lines,
+        which already include the change, so no delta is applied to them.
+        """
+        Node = self.sudo()
+        supervisor_ids = list({key[0] for key in deltas})
+        objective_ids = list({key[1] for key in deltas})
+        nodes = Node.search([
+            ('res_model', '=', model_name),
+            ('employee_id', 'in', supervisor_ids),
+            ('objective_id', 'in', objective_ids),
+        ])
+        node_by_key = {(node.employee_id.id, node.objective_id.id): node for node in nodes}
+
+        result = {}
+        for key, (delta_total, delta_count) in deltas.items():
+            node = node_by_key.get(key)
+            if node:
+                node.write({'total': node.total + delta_total, 'count': node.count + delta_count})
+                result[key] = (node.total, node.count)
+
+        missing = [key for key in deltas if key not in node_by_key]
+        if missing:
+            rebuilt = self._compute_totals(model_name, missing)
+            Node.create([{
+                'res_model': model_name,
+                'employee_id': key[0],
+                'objective_id': key[1],
+                'total': rebuilt[key][0],
+                'count': rebuilt[key][1],
+            } for key in missing])
+            result.update(rebuilt)
+        return result
+
+    @api.model
+    def _compute_totals(self, model_name, keys):
+        """Sum and count positive subordinate achievements for (supervisor, objective) keys"""
+        line_model, link = self.env['performance.aggregation']._line_models[model_name]
+        subordinates = self.env['hr.employee'].search_fetch(
+            [('parent_id', 'in', list({key[0] for key in keys}))], ['parent_id'])
+        supervisor_of = {sub.id: sub.parent_id.id for sub in subordinates}
+        lines = self.env[line_model].search_fetch([
+            (f'{link}.employee_id', 'in', subordinates.ids),
+            ('objective_id', 'in', list({key[1] for key in keys})),
+            ('achieved_percentage', '>', 0),
+        ], [link, 'objective_id', 'achieved_percentage'])
+
+        totals = {key: (0.0, 0) for key in keys}
+        for line in lines:
+            key = (supervisor_of[line[link].employee_id.id], line.objective_id.id)
+            if key in totals:
+                total, count = totals[key]
+                totals[key] = (total + line.achieved_percentage, count + 1)
+        return totals
+
+    @api.model
+    def _invalidate(self, employees=None, objectives=None):
+        """Mark cached totals dirty by dropping them; they are rebuilt on the next change"""
+        domain = []
+        if employees is not None:
+            domain.append(('employee_id', 'in', employees.ids))
+        if objectives is not None:
+            domain.append(('objective_id', 'in', objectives.ids))
+        self.sudo().search(domain).unlink()
+
+
+class PerformanceRollupLine(models.AbstractModel):
+    _name = 'performance.rollup.line'
+    _description = 'Incrementally Rolled-up Line'
+
+    # Performance or KPI model the inheriting line model belongs to
+    _rollup_model = None
+
+    def _rollup_enabled(self):
+        return (not self.env.context.get('skip_rollup_propagation')
+                and self.env['performance.aggregation']._is_incremental())
+
+    def _rollup_contributions(self):
+        link = self.env['performance.aggregation']._line_models[self._rollup_model][1]
+        return {
+            line.id: (line[link].employee_id.id, line.objective_id.id, line.achieved_percentage)
+            for line in self
+        }
+
+    def _rollup_dependents(self):
+        """Rollup lines of other models whose achievement is computed from these lines.
+
+        Their recomputation bypasses write(), so whoever changes these lines
+        propagates theirs too, see _rollup_snapshot().
+        """
+        return []
+
+    def _rollup_snapshot(self):
+        """Current contributions of these lines and of their dependents, as (lines, contributions) pairs"""
+        return [(lines, lines._rollup_contributions()) for lines in [self, *self._rollup_dependents()] if lines]
+
+    def _rollup_propagate(self, snapshot):
+        """Propagate the changes made since snapshot was taken; reading dependents recomputes them"""
+        Aggregation = self.env['performance.aggregation'].with_context(skip_rollup_propagation=False)
+        for lines, before in snapshot:
+            lines = lines.exists()
+            Aggregation._propagate(lines._rollup_model, before, lines._rollup_contributions())
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        if lines._rollup_enabled():
+            self.env['performance.aggregation']._propagate(self._rollup_model, {}, lines._rollup_contributions())
+        return lines
+
+    def write(self, vals):
+        if not self._rollup_enabled():
+            return super().write(vals)
+        snapshot = self._rollup_snapshot()
+        res = super().write(vals)
+        self._rollup_propagate(snapshot)
+        return res
+
+    def unlink(self):
+        if not self._rollup_enabled():
+            return super().unlink()
+        before = self._rollup_contributions()
+        model_name = self._rollup_model
+        res = super().unlink()
+        self.env['performance.aggregation']._propagate(model_name, before, {})
+        return res
@@ -0,0 +1,303 @@
+import logging
+import random
+import time
+from collections import defaultdict
+
+from psycopg2 import errors
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Crons sharing the partitions of parallel jobs: at most this many partitions
+# are aggregated concurrently, given enough server cron threads
+PARTITION_CRONS = [f'employee_performance.ir_cron_process_aggregation_partitions_{i}' for i in range(1, 5)]
+
+# Transient conflicts between concurrent partitions, worth replaying the partition
+CONCURRENCY_ERRORS = (errors.SerializationFailure, errors.DeadlockDetected, errors.LockNotAvailable)
+MAX_RETRIES = 5
+
+
+class PerformanceAggregationJob(models.Model):
+    _name = 'performance.aggregation.job'
+    _description = 'Background Aggregation Job'
+    _order = 'id desc'
+
+    employee_id = fields.Many2one('hr.employee', string='Top Employee', required=True, index=True, ondelete='cascade')
+    user_id = fields.Many2one('res.users', string='Requested By', default=lambda self: self.env.uid)
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='queued', required=True)
+    chunk_size = fields.Integer(string='Supervisors per Chunk', default=200)
+
+    # Checkpoint: supervisor ids per depth level (top first), processed from
+    # the deepest level up; committed after every chunk
+    levels = fields.Json(string='Supervisors per Level')
+    level_index = fields.Integer(string='Current Level')
+    level_offset = fields.Integer(string='Offset in Level')
+
+    # Parallel mode: disjoint subtrees aggregated by the partition crons, the
+    # levels above them are then merged by the job itself
+    parent_id = fields.Many2one('performance.aggregation.job', string='Job', index=True, ondelete='cascade')
+    partition_ids = fields.One2many('performance.aggregation.job', 'parent_id', string='Partitions')
+    root_ids = fields.Json(string='Subtree Roots')
+
+    total_count = fields.Integer(string='Supervisors')
+    done_count = fields.Integer(string='Processed')
+    checked_count = fields.Integer(string='Records Checked')
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    date_start = fields.Datetime(string='Started On')
+    date_end = fields.Datetime(string='Finished On')
+    error = fields.Text(string='Error')
+
+    @api.depends('total_count', 'done_count', 'state', 'partition_ids.done_count')
+    def _compute_progress(self):
+        for job in self:
+            if job.state == 'done':
+                job.progress = 100.0
+            else:
+                done_count = job.done_count + sum(job.partition_ids.mapped('done_count'))
+                job.progress = 100.0 * done_count / job.total_count if job.total_count else 0.0
+
+    @api.model
+    def _enqueue(self, employees):
+        """Create a job per employee without one pending and wake up the cron"""
+        pending = self.search([
+            ('employee_id', 'in', employees.ids),
+            ('parent_id', '=', False),
+            ('state', 'in', ('queued', 'running')),
+        ])
+        jobs = self.create([{'employee_id': emp.id} for emp in employees - pending.employee_id])
+        if jobs:
+            self.env.ref('employee_performance.ir_cron_process_aggregation_jobs')._trigger()
+        return jobs | pending
+
+    def action_retry(self):
+        for job in self:
+            # Failed partitions are claimed again by the partition crons, from their checkpoint
+            for partition in job.partition_ids.filtered(lambda p: p.state == 'failed'):
+                partition.write({'state': 'running' if partition.levels else 'queued', 'error': False})
+            job.write({'state': 'running' if job.levels else 'queued', 'error': False})
+        self.env.ref('employee_performance.ir_cron_process_aggregation_jobs')._trigger()
+        self._trigger_partitions()
+
+    @api.model
+    def _trigger_partitions(self):
+        for xmlid in PARTITION_CRONS:
+            self.env.ref(xmlid)._trigger()
+
+    @api.model
+    def _cron_process_jobs(self, time_limit=240):
+        """Process pending jobs until time_limit seconds elapsed, then reschedule"""
+        deadline = time.monotonic() + time_limit
+        for job in self.search([('parent_id', '=', False), ('state', 'in', ('queued', 'running'))], order='id'):
+            if not job._run(deadline):
+                self.env.ref('employee_performance.ir_cron_process_aggregation_jobs')._trigger()
+                return
+
+    def _run(self, deadline):
+        """Aggregate the job's subtree chunk by chunk from the leaves up, resuming from the checkpoint.
+
+        In parallel mode, the subtrees below the split are left to the
+        partitions and only the levels above are processed here, once every
+        partition is done. Returns False when the deadline was reached
+        before the job finished.
+        """
+        self.ensure_one()
+        Aggregation = self.env['performance.aggregation'].with_context(performance_bulk_mode=True)
+        try:
+            if self.state == 'queued':
+                levels, children = Aggregation._load_hierarchy(self.employee_id)
+                buckets = []
+                partitions = Aggregation._get_parallel_workers()
+                if partitions > 1 and len(levels) > 2:
+                    top_levels, buckets = Aggregation._partition(levels, children, partitions)
+                    if len(buckets) > 1:
+                        levels = top_levels
+                    else:
+                        buckets = []
+                partition_counts = [self._count_supervisors(bucket, children) for bucket in buckets]
+                self._start(levels, children, sum(partition_counts))
+                if buckets:
+                    self.create([{
+                        'employee_id': self.employee_id.id,
+                        'user_id': self.user_id.id,
+                        'parent_id': self.id,
+                        'root_ids': bucket,
+                        'total_count': count,
+                    } for bucket, count in zip(buckets, partition_counts)])
+                    self._trigger_partitions()
+                self.env.cr.commit()
+
+            partitions = self.partition_ids
+            failed = partitions.filtered(lambda p: p.state == 'failed')
+            if failed:
+                raise UserError(f"Partition {failed[0].id} failed: {failed[0].error}")
+            if any(partition.state != 'done' for partition in partitions):
+                # Resumed by the last partition to finish
+                return True
+
+            if not self._process_levels(Aggregation, deadline):
+                return False
+
+            checked_count = self.checked_count + sum(partitions.mapped('checked_count'))
+            self.write({'state': 'done', 'date_end': fields.Datetime.now(), 'checked_count': checked_count})
+            if partitions:
+                # Partitions leave the dashboard snapshots to the job
+                self.env['performance.dashboard.snapshot']._invalidate()
+            self.env['performance.bulk.run']._log(
+                'aggregation', f"Aggregation below {self.employee_id.name}", checked_count,
+                f"{self.total_count} supervisors aggregated in {len(partitions) or 1} partitions, "
+                f"{checked_count} records marked as checked.")
+            self.env.cr.commit()
+        except Exception as e:
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'error': str(e)})
+            self.env.cr.commit()
+            _logger.exception("Aggregation job %s failed", self.id)
+        return True
+
+    def _start(self, levels, children, extra_count=0):
+        """Store the supervisors of levels as the checkpoint, processed from the deepest level up.
+
+        extra_count adds the supervisors left to the partitions to the total.
+        """
+        self.ensure_one()
+        # Employees without subordinates have nothing to aggregate
+        levels = [supervisors for supervisors in (
+            [emp_id for emp_id in level if children.get(emp_id)] for level in levels
+        ) if supervisors]
+        self.write({
+            'state': 'running',
+            'levels': levels,
+            'level_index': len(levels) - 1,
+            'level_offset': 0,
+            'total_count': sum(len(level) for level in levels) + extra_count,
+            'done_count': 0,
+            'checked_count': 0,
+            'date_start': fields.Datetime.now(),
+        })
+
+    def _process_levels(self, Aggregation, deadline, propagate=True):
+        """Aggregate the checkpoint's remaining chunks, committing after each one.
+
+        Returns False when the deadline was reached before the last chunk.
+        """
+        self.ensure_one()
+        levels = self.levels or []
+        while self.level_index >= 0:
+            level = levels[self.level_index]
+            chunk = level[self.level_offset:self.level_offset + max(self.chunk_size, 1)]
+            checked = Aggregation.aggregate_employees(self.env['hr.employee'].browse(chunk).exists(), propagate=propagate)
+            offset = self.level_offset + len(chunk)
+            if offset >= len(level):
+                checkpoint = {'level_index': self.level_index - 1, 'level_offset': 0}
+            else:
+                checkpoint = {'level_offset': offset}
+            self.write(dict(checkpoint, done_count=self.done_count + len(chunk),
+                            checked_count=self.checked_count + checked))
+            self.env.cr.commit()
+            self.env.invalidate_all()
+            if time.monotonic() > deadline:
+                return False
+        return True
+
+    @api.model
+    def _count_supervisors(self, root_ids, children):
+        """Number of employees with subordinates in the subtrees below root_ids"""
+        count = 0
+        stack = list(root_ids)
+        while stack:
+            subordinates = children.get(stack.pop())
+            if subordinates:
+                count += 1
+                stack.extend(subordinates)
+        return count
+
+    @api.model
+    def _cron_process_partitions(self, time_limit=240):
+        """Claim and aggregate pending partitions until none is left or time_limit seconds elapsed.
+
+        Every partition cron runs this loop. Partitions are aggregated chunk
+        by chunk with a committed checkpoint, like jobs, so the claim is an
+        advisory lock held by a separate cursor for the whole run rather
+        than a row lock: partitions run concurrently on separate cron
+        workers, and one interrupted by a crash or a timeout is resumed by
+        the next worker. Conflicts between partitions are retried with a
+        backoff.
+        """
+        deadline = time.monotonic() + time_limit
+        attempts = defaultdict(int)
+        cr = self.env.cr
+        with self.env.registry.cursor() as lock_cr:
+            while time.monotonic() < deadline:
+                partition = self._claim_partition(lock_cr)
+                if not partition:
+                    return
+                try:
+                    if not partition._run_partition(deadline):
+                        break
+                except CONCURRENCY_ERRORS as e:
+                    cr.rollback()
+                    attempts[partition.id] += 1
+                    if attempts[partition.id] < MAX_RETRIES:
+                        _logger.info("Aggregation partition %s conflicted, retrying", partition.id)
+                        time.sleep(random.uniform(0, 0.5 * 2 ** attempts[partition.id]))
+                        continue
+                    partition.write({'state': 'failed', 'error': str(e)})
+                    _logger.exception("Aggregation partition %s failed", partition.id)
+                except Exception as e:
+                    cr.rollback()
+                    partition.write({'state': 'failed', 'error': str(e)})
+                    _logger.exception("Aggregation partition %s failed", partition.id)
+                # The job merges the top levels once all its partitions are done
+                self.env.ref('employee_performance.ir_cron_process_aggregation_jobs')._trigger()
+                cr.commit()
+                self.env.invalidate_all()
+        self._trigger_partitions()
+
+    @api.model
+    def _claim_partition(self, lock_cr):
+        """First pending partition no other worker holds, locked until lock_cr's transaction ends"""
+        self.env.cr.execute(SQL(
+            """
+            SELECT id FROM performance_aggregation_job
+             WHERE parent_id IS NOT NULL AND state IN ('queued', 'running')
+          ORDER BY id
+            """
+        ))
+        for (partition_id,) in self.env.cr.fetchall():
+            lock_cr.execute(SQL(
+                "SELECT pg_try_advisory_xact_lock('performance_aggregation_job'::regclass::oid::int, %s)",
+                partition_id,
+            ))
+            if lock_cr.fetchone()[0]:
+                return self.browse(partition_id)
+        return self.browse()
+
+    def _run_partition(self, deadline):
+        """Aggregate the subtrees of this partition chunk by chunk, resuming from the checkpoint.
+
+        Returns False when the deadline was reached before the partition finished.
+        """
+        self.ensure_one()
+        if self.state not in ('queued', 'running'):
+            # Finished by another worker since it was listed
+            return True
+        Aggregation = self.env['performance.aggregation'].with_context(
+            performance_bulk_mode=True, performance_defer_invalidation=True)
+        if self.state == 'queued':
+            levels, children = Aggregation._load_hierarchy(self.env['hr.employee'].browse(self.root_ids).exists())
+            self._start(levels, children)
+            self.env.cr.commit()
+        # The job's merge of the levels above refreshes their totals: no
+        # concurrent propagation into them from every partition
+        if not self._process_levels(Aggregation, deadline, propagate=False):
+            return False
+        self.write({'state': 'done', 'date_end': fields.Datetime.now()})
+        return True
@@ -0,0 +1,218 @@
+import logging
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from .telemetry import add_touched_records, profiled
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HISTOGRAM_BINS = 10
+
+
+class PerformanceRatingDistribution(models.Model):
+    _name = 'performance.rating.distribution'
+    _description = 'Rating Distribution'
+    _order = 'level_id, metric, objective_id'
+
+    level_id = fields.Many2one('performance.level', string='Level', index=True, ondelete='cascade')
+    objective_id = fields.Many2one('performance.objective', string='Objective', ondelete='cascade')
+    metric = fields.Selection([
+        ('overall_rating', 'Overall Rating'),
+        ('achieved_percentage', 'Achieved Percentage'),
+    ], string='Metric', required=True)
+    count = fields.Integer(string='Count')
+    mean = fields.Float(string='Mean')
+    std = fields.Float(string='Std. Deviation')
+    p25 = fields.Float(string='P25')
+    p50 = fields.Float(string='Median')
+    p75 = fields.Float(string='P75')
+    p90 = fields.Float(string='P90')
+    # {'edges': [...], 'counts': [...]}
+    histogram = fields.Json(string='Histogram')
+    histogram_display = fields.Text(string='Histogram Bins', compute='_compute_histogram_display')
+    date = fields.Datetime(string='Computed On')
+
+    @api.depends('histogram')
+    def _compute_histogram_display(self):
+        for rec in self:
+            histogram = rec.histogram or {}
+            edges, counts = histogram.get('edges', []), histogram.get('counts', [])
+            rec.histogram_display = '\n'.join(
+                f"{low:g} - {high:g}: {count}" for low, high, count in zip(edges, edges[1:], counts))
+
+
+class PerformanceAnalytics(models.AbstractModel):
+    _name = 'performance.analytics'
+    _description = 'Batch Ranking and Distribution Analytics'
+
+    @api.model
+    def _cron_compute_analytics(self):
+        if np is None:
+            _logger.warning("NumPy is not installed, skipping the performance analytics")
+            return
+        self._compute_analytics()
+
+    @api.model
+    @profiled('performance.analytics._compute_analytics')
+    def _compute_analytics(self):
+        """Rank each employee's latest KPI within its level and store rating distributions.
+
+        Values are pulled as flat arrays with one query per metric; ranks,
+        percentiles, z-scores and histograms are computed vectorized per group
+        and written back with one UPDATE per table. Only rows whose values
+        changed are written, with their write_date, so incremental consumers
+        such as the BI API pull just those.
+        """
+        if np is None:
+            raise UserError("The performance analytics require the numpy Python library.")
+        self.env.flush_all()
+        now = fields.Datetime.now()
+        distributions = self._rank_kpis(now) + self._score_lines(now)
+
+        Distribution = self.env['performance.rating.distribution'].sudo()
+        Distribution.search([]).unlink()
+        Distribution.create(distributions)
+        self.env.invalidate_all()
+
+    @api.model
+    def _fetch_arrays(self, query):
+        """Run query and return its columns as NumPy arrays"""
+        self.env.cr.execute(query)
+        rows = self.env.cr.fetchall()
+        add_touched_records(len(rows))
+        if not rows:
+            return None
+        return [np.array(column) for column in zip(*rows)]
+
+    @api.model
+    def _groups(self, *keys):
+        """Yield (key values, index array) for each distinct combination of the key arrays"""
+        stacked = np.stack(keys, axis=1)
+        unique, inverse = np.unique(stacked, axis=0, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind='stable')
+        bounds = np.cumsum(np.bincount(inverse.ravel()))[:-1]
+        for key, indexes in zip(unique, np.split(order, bounds)):
+            yield tuple(int(k) for k in key), indexes
+
+    @api.model
+    def _distribution(self, values, metric, level_id, objective_id=False, date=None):
+        # Ratings are out of 5, achievements in percent; outliers (negative
+        # revenue growth included) widen the range
+        value_range = (min(0.0, float(values.min())), max(5.0 if metric == 'overall_rating' else 100.0, float(values.max())))
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS, range=value_range)
+        p25, p50, p75, p90 = np.percentile(values, [25, 50, 75, 90])
+        return {
+            'level_id': level_id,
+            'objective_id': objective_id,
+            'metric': metric,
+            'count': len(values),
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'p25': float(p25),
+            'p50': float(p50),
+            'p75': float(p75),
+            'p90': float(p90),
+            'histogram': {'edges': [round(float(edge), 2) for edge in edges], 'counts': counts.tolist()},
+            'date': date,
+        }
+
+    @api.model
+    def _zscores(self, values):
+        std = values.std()
+        if not std:
+            return np.zeros(len(values))
+        return (values - values.mean()) / std
+
+    @api.model
+    def _rank_kpis(self, date):
+        """Rank, percentile and z-score of every employee's latest KPI within its level"""
+        cr = self.env.cr
+        arrays = self._fetch_arrays(SQL(
+            """
+            SELECT k.id, k.level_id, COALESCE(k.overall_rating, 0)
+              FROM employee_kpi k
+              JOIN hr_employee e ON e.latest_kpi_id = k.id
+            """
+        ))
+        # Older KPIs are no longer ranked
+        cr.execute(SQL(
+            """
+            UPDATE employee_kpi
+               SET level_rank = NULL, level_percentile = NULL, rating_zscore = NULL,
+                   write_date = (now() at time zone 'UTC'), write_uid = %s
+             WHERE level_rank IS NOT NULL AND id NOT IN (SELECT latest_kpi_id FROM hr_employee WHERE latest_kpi_id IS NOT NULL)
+            """,
+            self.env.uid,
+        ))
+        if arrays is None:
+            return []
+        ids, levels, ratings = arrays
+        ratings = ratings.astype(float)
+
+        ranks = np.zeros(len(ids), dtype=int)
+        percentiles = np.zeros(len(ids))
+        zscores = np.zeros(len(ids))
+        distributions = []
+        for (level_id,), indexes in self._groups(levels):
+            values = ratings[indexes]
+            ordered = np.sort(values)
+            at_or_below = np.searchsorted(ordered, values, side='right')
+            # Rank 1 is the best rating; ties share the best rank
+            ranks[indexes] = len(values) - at_or_below + 1
+            percentiles[indexes] = np.round(100.0 * at_or_below / len(values), 2)
+            zscores[indexes] = np.round(self._zscores(values), 4)
+            distributions.append(self._distribution(values, 'overall_rating', level_id, date=date))
+
+        cr.execute(SQL(
+            """
+            UPDATE employee_kpi k
+               SET level_rank = v.rank, level_percentile = v.percentile, rating_zscore = v.zscore,
+                   write_date = (now() at time zone 'UTC'), write_uid = %s
+              FROM unnest(%s::int[], %s::int[], %s::float8[], %s::float8[]) AS v(id, rank, percentile, zscore)
+             WHERE k.id = v.id
+               AND (k.level_rank, k.level_percentile, k.rating_zscore) IS DISTINCT FROM (v.rank, v.percentile, v.zscore)
+            """,
+            self.env.uid, ids.tolist(), ranks.tolist(), percentiles.tolist(), zscores.tolist(),
+        ))
+        return distributions
+
+    @api.model
+    def _score_lines(self, date):
+        """Z-score of every performance line's achievement within its level and objective"""
+        arrays = self._fetch_arrays(SQL(
+            """
+            SELECT id, level_id, objective_id, COALESCE(achieved_percentage, 0)
+              FROM employee_performance_line
+             WHERE level_id IS NOT NULL
+            """
+        ))
+        if arrays is None:
+            return []
+        ids, levels, objectives, achieved = arrays
+        achieved = achieved.astype(float)
+
+        zscores = np.zeros(len(ids))
+        distributions = []
+        for (level_id, objective_id), indexes in self._groups(levels, objectives):
+            values = achieved[indexes]
+            zscores[indexes] = np.round(self._zscores(values), 4)
+            distributions.append(self._distribution(values, 'achieved_percentage', level_id, objective_id, date))
+
+        self.env.cr.execute(SQL(
+            """
+            UPDATE employee_performance_line l
+               SET achieved_zscore = v.zscore,
+                   write_date = (now() at time zone 'UTC'), write_uid = %s
+              FROM unnest(%s::int[], %s::float8[]) AS v(id, zscore)
+             WHERE l.id = v.id AND l.achieved_zscore IS DISTINCT FROM v.zscore
+            """,
+            self.env.uid, ids.tolist(), zscores.tolist(),
+        ))
+        return distributions
@@ -0,0 +1,164 @@
+import csv
+import io
+import tempfile
+
+import xlsxwriter
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+# Export kind -> (record model, line model, field linking the line to its record, exported line fields)
+EXPORT_KINDS = {
+    'performance': ('employee.performance', 'employee.performance.line', 'performance_id', [
+        'objective_id', 'target_percentage', 'achieved_percentage', 'timeline_from', 'timeline_to',
+        'number_of_job_completed', 'number_of_wo', 'number_of_job_fixed_single_visit',
+        'number_of_job_attend', 'number_of_job_scheduled', 'number_of_job_submitted',
+        'number_of_job_opportunities', 'number_of_incidents', 'achieve_rating',
+        'previous_year_revenue', 'current_year_revenue', 'revenue_increased',
+    ]),
+    'kpi': ('employee.kpi', 'employee.kpi.line', 'kpi_id', [
+        'objective_id', 'achieved_percentage', 'weightage', 'rating', 'final_rating',
+    ]),
+}
+
+# Exported record fields, for both kinds
+RECORD_FIELDS = ['name', 'employee_id', 'supervisor_id', 'level_id', 'state']
+
+
+class PerformanceAppraisalExport(models.AbstractModel):
+    _name = 'performance.appraisal.export'
+    _description = 'Streaming Appraisal Export'
+
+    @api.model
+    def _get_kind(self, kind):
+        if kind not in EXPORT_KINDS:
+            raise UserError(f"Unknown appraisal export {kind!r}.")
+        return EXPORT_KINDS[kind]
+
+    @api.model
+    def _headers(self, kind):
+        model_name, line_model, _link, line_fields = self._get_kind(kind)
+        Record, Line = self.env[model_name], self.env[line_model]
+        headers = [Record._fields[fname].string for fname in RECORD_FIELDS]
+        headers.insert(1, 'Employee ID')
+        return headers + [Line._fields[fname].string for fname in line_fields]
+
+    @api.model
+    def _export_value(self, record, fname):
+        field = record._fields[fname]
+        value = record[fname]
+        if field.type == 'many2one':
+            return value.display_name or ''
+        if field.type == 'selection':
+            return dict(field._description_selection(self.env)).get(value, '')
+        if field.type == 'date':
+            return fields.Date.to_string(value) or ''
+        return value if value is not False else ''
+
+    @api.model
+    def _iter_rows(self, kind, domain=None, page_size=1000):
+        """Yield one row per line (or per record without lines), page by page.
+
+        Records are paged on id > last id, so every page costs the same
+        whatever its position. Lines and related names of a page are fetched
+        in bulk, and the cache is dropped after each page to keep memory flat.
+        """
+        model_name, line_model, link, line_fields = self._get_kind(kind)
+        Record, Line = self.env[model_name], self.env[line_model]
+        domain = list(domain or [])
+        last_id = 0
+        while True:
+            records = Record.search_fetch(domain + [('id', '>', last_id)], RECORD_FIELDS, order='id', limit=page_size)
+            if not records:
+                return
+            last_id = records[-1].id
+            lines = Line.search_fetch([(link, 'in', records.ids)], [link] + line_fields, order=f'{link}, id')
+            # Warm the prefetch of related names for the whole page
+            (records.employee_id | records.supervisor_id).fetch(['name', 'employee_code'])
+            records.level_id.fetch(['name'])
+            lines.objective_id.fetch(['name'])
+
+            lines_by_record = {}
+            for line in lines:
+                lines_by_record.setdefault(line[link].id, []).append(line)
+            for record in records:
+                head = [self._export_value(record, fname) for fname in RECORD_FIELDS]
+                head.insert(1, record.employee_id.employee_code or '')
+                record_lines = lines_by_record.get(record.id)
+                if not record_lines:
+                    yield head + [''] * len(line_fields)
+                for line in record_lines or ():
+                    yield head + [self._export_value(line, fname) for fname in line_fields]
+            self.env.invalidate_all()
+
+    @api.model
+    def stream_csv(self, kind, domain=None, page_size=1000):
+        """Generator of CSV bytes chunks, one chunk per page"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self._headers(kind))
+        count = 0
+        for row in self._iter_rows(kind, domain, page_size):
+            writer.writerow(row)
+            count += 1
+            if count % page_size == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode('utf-8')
+
+    @api.model
+    def stream_xlsx(self, kind, domain=None, page_size=1000, chunk_size=64 * 1024):
+        """Generator of XLSX bytes chunks.
+
+        The workbook is written in constant_memory mode, which flushes each
+        row to a temporary file; the finished file is then streamed back.
+        """
+        with tempfile.TemporaryFile() as tmp:
+            workbook = xlsxwriter.Workbook(tmp, {'constant_memory': True, 'in_memory': False})
+            sheet = workbook.add_worksheet(kind.upper())
+            bold = workbook.add_format({'bold': True})
+            sheet.write_row(0, 0, self._headers(kind), bold)
+            for row_index, row in enumerate(self._iter_rows(kind, domain, page_size), 1):
+                sheet.write_row(row_index, 0, row)
+            workbook.close()
+
+            tmp.seek(0)
+            while chunk := tmp.read(chunk_size):
+                yield chunk
+
+    @api.model
+    def _action_export(self, records, kind, file_format='xlsx'):
+        """URL action downloading the given records, or everything when records is empty.
+
+        The selection is stored server side and only its id goes in the URL,
+        which stays short however many records are selected.
+        """
+        url = f'/employee_performance/export/{kind}/{file_format}'
+        if records:
+            selection = self.env['performance.appraisal.export.selection'].create({
+                'kind': kind,
+                'record_ids': records.ids,
+            })
+            url += f'?selection={selection.id}'
+        return {'type': 'ir.actions.act_url', 'url': url, 'target': 'self'}
+
+
+class PerformanceAppraisalExportSelection(models.TransientModel):
+    _name = 'performance.appraisal.export.selection'
+    _description = 'Appraisal Export Selection'
+
+    kind = fields.Selection([(kind, kind.title()) for kind in EXPORT_KINDS], string='Kind', required=True)
+    record_ids = fields.Json(string='Selected Records')
+
+    @api.model
+    def _get_record_ids(self, selection_id, kind):
+        """Ids stored by the current user's selection for kind; ValueError when there is none"""
+        selection = self.search([
+            ('id', '=', selection_id),
+            ('kind', '=', kind),
+            ('create_uid', '=', self.env.uid),
+        ])
+        if not selection:
+            raise ValueError(f"Unknown export selection {selection_id!r}.")
+        return [int(record_id) for record_id in selection.record_ids or []]
@@ -0,0 +1,61 @@
+from odoo import models, api
+from odoo.exceptions import AccessError, UserError
+from odoo.tools import SQL
+
+# Dataset -> (model, fields returned when no projection is requested)
+BI_DATASETS = {
+    'performance_lines': ('employee.performance.line', [
+        'performance_id', 'level_id', 'objective_id', 'target_percentage', 'achieved_percentage',
+        'timeline_from', 'timeline_to',
+    ]),
+    'kpi_lines': ('employee.kpi.line', [
+        'kpi_id', 'objective_id', 'achieved_percentage', 'weightage', 'rating', 'final_rating',
+    ]),
+    'employees': ('hr.employee', [
+        'name', 'employee_code', 'parent_id', 'parent_path', 'grade', 'division_title', 'overall_rating',
+    ]),
+}
+
+
+class PerformanceBiApi(models.AbstractModel):
+    _name = 'performance.bi.api'
+    _description = 'BI Data API'
+
+    @api.model
+    def _fetch_page(self, dataset, fnames=None, cursor=None, limit=1000):
+        """Return one page of dataset rows changed after cursor, and the cursor after it.
+
+        Rows are ordered on (write_date, id) and the cursor is the last pair
+        returned, so incremental pulls only read what changed since. The page
+        is a single SQL query on stored columns, with model access rights,
+        field groups and record rules applied.
+        """
+        if dataset not in BI_DATASETS:
+            raise UserError(f"Unknown dataset {dataset!r}.")
+        model_name, default_fnames = BI_DATASETS[dataset]
+        Model = self.env[model_name]
+        fnames = fnames or default_fnames
+        for fname in fnames:
+            field = Model._fields.get(fname)
+            if not field or not field.store or not field.column_type:
+                raise UserError(f"Field {fname!r} cannot be projected from {dataset}.")
+            # Columns are read in raw SQL, which bypasses the fields' groups
+            if not Model._has_field_access(field, 'read'):
+                raise AccessError(f"You are not allowed to read field {fname!r} of {dataset}.")
+        columns = ['id', 'write_date'] + [fname for fname in fnames if fname not in ('id', 'write_date')]
+
+        query = Model._search([], order='write_date, id', limit=limit)
+        if cursor:
+            write_date, last_id = cursor
+            query.add_where(SQL(
+                "(%s, %s) > (%s::timestamp, %s)",
+                SQL.identifier(Model._table, 'write_date'), SQL.identifier(Model._table, 'id'),
+                write_date, last_id,
+            ))
+        self.env.cr.execute(query.select(*(SQL.identifier(Model._table, fname) for fname in columns)))
+        rows = [dict(zip(columns, values)) for values in self.env.cr.fetchall()]
+
+        # An empty page keeps the cursor: the next pull starts from the same point
+        if rows:
+            cursor = (rows[-1]['write_date'].isoformat(sep=' '), rows[-1]['id'])
+        return rows, cursor
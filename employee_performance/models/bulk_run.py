@@ -0,0 +1,29 @@
+from odoo import models, fields, api
+
+
+class PerformanceBulkRun(models.Model):
+    _name = 'performance.bulk.run'
+    _description = 'Bulk Operation Run'
+    _inherit = ['mail.thread']
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', required=True)
+    operation = fields.Selection([
+        ('aggregation', 'Aggregation'),
+        ('import', 'Counter Import'),
+        ('review_cycle', 'Review Cycle Generation'),
+    ], string='Operation', required=True)
+    user_id = fields.Many2one('res.users', string='User', default=lambda self: self.env.uid)
+    record_count = fields.Integer(string='Records')
+    date = fields.Datetime(string='Date', default=fields.Datetime.now)
+
+    @api.model
+    def _log(self, operation, name, record_count, summary):
+        """Record a bulk run with one summary message, in place of per-record tracking"""
+        run = self.sudo().with_context(tracking_disable=True).create({
+            'name': name,
+            'operation': operation,
+            'record_count': record_count,
+        })
+        run.message_post(body=summary)
+        return run
@@ -1,8 +1,12 @@
 from odoo import models, fields, api
+from odoo.tools import split_every
+
+from .duration import format_duration
 
 class PerformanceLevel(models.Model):
     _name = 'performance.level'
     _description = 'Performance Level'
+    _inherit = ['performance.dashboard.source']
     _rec_name = 'name'
 
     name = fields.Char(string='Level Name', required=True)
@@ -18,6 +22,68 @@ class PerformanceLevel(models.Model):
         for rec in self:
             rec.number_of_res_employees = len(rec.res_employee_ids)
 
+    def _prepare_performance_line_vals(self):
+        """Values of the performance lines generated from this level's objectives"""
+        self.ensure_one()
+        return [{
+            'objective_id': objective_line.objective_id.id,
+            'target_percentage': objective_line.target_percentage,
+            'timeline_from': objective_line.timeline_from,
+            'timeline_to': objective_line.timeline_to,
+        } for objective_line in self.objective_line_ids]
+
+    def _prepare_kpi_line_vals(self, employee, performance_lines):
+        """Values of the KPI lines generated from this level's objectives for employee.
+
+        performance_lines maps (employee id, objective id) to the performance
+        line id the KPI line takes its achievement from.
+        """
+        self.ensure_one()
+        return [{
+            'objective_id': objective_line.objective_id.id,
+            'performance_line_id': performance_lines.get((employee.id, objective_line.objective_id.id), False),
+            'weightage': 0.0,
+            'rating': 0.0,
+        } for objective_line in self.objective_line_ids]
+
+    def _open_review_cycle(self, employees, performance=True, kpi=True, batch_size=1000):
+        """Create performance and KPI records with their lines for employees, in batches.
+
+        KPI lines are linked to the batch's performance lines, resolved with
+        one query per batch. Returns the created performance and KPI records.
+        """
+        self.ensure_one()
+        # Bulk creation: no creation message, follower or tracking per record
+        env = self.with_context(tracking_disable=True).env
+        Performance, PerformanceLine = env['employee.performance'], env['employee.performance.line']
+        KPI, KPILine = env['employee.kpi'], env['employee.kpi.line']
+
+        objectives = self.objective_line_ids.objective_id
+        performance_line_vals = self._prepare_performance_line_vals()
+
+        performances, kpis = Performance, KPI
+        for batch in split_every(batch_size, employees.ids, self.env['hr.employee'].browse):
+            if performance:
+                records = Performance.create([{'employee_id': emp.id, 'level_id': self.id} for emp in batch])
+                PerformanceLine.create([
+                    dict(vals, performance_id=record.id)
+                    for record in records for vals in performance_line_vals
+                ])
+                performances |= records
+            if kpi:
+                performance_lines = KPI._get_performance_lines(batch, objectives)
+                records = KPI.create([{'employee_id': emp.id, 'level_id': self.id} for emp in batch])
+                KPILine.create([
+                    dict(vals, kpi_id=record.id)
+                    for record, emp in zip(records, batch)
+                    for vals in self._prepare_kpi_line_vals(emp, performance_lines)
+                ])
+                kpis |= records
+        self.env['performance.bulk.run']._log(
+            'review_cycle', f"Review cycle {self.name}", len(performances) + len(kpis),
+            f"{len(performances)} performance and {len(kpis)} KPI records created for {len(employees)} employees.")
+        return performances, kpis
+
 
 class PerformanceLevelObjectiveLine(models.Model):
     _name = 'performance.level.objective.line'
@@ -36,17 +102,7 @@ class PerformanceLevelObjectiveLine(models.Model):
     def _compute_timeline_duration(self):
         for rec in self:
             if rec.timeline_from and rec.timeline_to:
-                delta = rec.timeline_to - rec.timeline_from
-                years = delta.days // 365
-                months = (delta.days % 365) // 30
-                days = (delta.days % 365) % 30
-                
-                if years > 0:
-                    rec.timeline_duration = f"{years} years {months} months {days} days"
-                elif months > 0:
-                    rec.timeline_duration = f"{months} months {days} days"
-                else:
-                    rec.timeline_duration = f"{days} days"
+                rec.timeline_duration = format_duration(rec.timeline_from, rec.timeline_to)
             else:
                 rec.timeline_duration = ''
 
@@ -66,4 +122,11 @@ class PerformanceObjective(models.Model):
     show_service_reports = fields.Boolean(string='Show Service Reports', default=False)
     show_safety_incidents = fields.Boolean(string='Show Safety Incidents', default=False)
     show_quality_score = fields.Boolean(string='Show Quality Score', default=False)
-    show_revenue = fields.Boolean(string='Show Revenue Fields', default=False)
\ No newline at end of file
+    show_revenue = fields.Boolean(string='Show Revenue Fields', default=False)
+
+    def write(self, vals):
+        res = super().write(vals)
+        # The flags select the achievement formula: recompute the lines in bulk
+        if any(fname.startswith('show_') for fname in vals):
+            self.env['employee.performance.line']._recompute_achieved_percentage_bulk(self)
+        return res
\ No newline at end of file
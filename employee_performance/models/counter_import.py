@@ -0,0 +1,240 @@
+import csv
+import io
+import itertools
+import json
+import logging
+import time
+
+from odoo import models, fields, api
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Source columns mapped onto employee.performance.line, with their converters
+COUNTER_FIELDS = {
+    'number_of_job_completed': int,
+    'number_of_wo': int,
+    'number_of_job_fixed_single_visit': int,
+    'number_of_job_attend': int,
+    'number_of_job_scheduled': int,
+    'number_of_job_submitted': int,
+    'number_of_job_opportunities': int,
+    'number_of_incidents': int,
+    'achieve_rating': float,
+    'previous_year_revenue': float,
+    'current_year_revenue': float,
+}
+
+
+class PerformanceCounterImport(models.Model):
+    _name = 'performance.counter.import'
+    _description = 'Field-Service Counter Import'
+    _order = 'id desc'
+
+    name = fields.Char(string='Name', required=True, default=lambda self: fields.Datetime.to_string(fields.Datetime.now()))
+    data_file = fields.Binary(string='File', attachment=True, required=True)
+    file_name = fields.Char(string='File Name')
+    file_format = fields.Selection([
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ], string='Format', required=True, default='csv')
+    chunk_size = fields.Integer(string='Rows per Chunk', default=2000)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='draft', readonly=True)
+
+    # Progress, committed after every chunk; rows_done doubles as resume checkpoint
+    rows_done = fields.Integer(string='Rows Processed', readonly=True)
+    rows_updated = fields.Integer(string='Lines Updated', readonly=True)
+    rows_created = fields.Integer(string='Lines Created', readonly=True)
+    rows_skipped = fields.Integer(string='Rows Skipped', readonly=True)
+    error_log = fields.Text(string='Errors', readonly=True)
+
+    def action_start(self):
+        """Queue the import; the cron processes it in chunks"""
+        self.write({'state': 'queued'})
+        self.env.ref('employee_performance.ir_cron_process_counter_imports')._trigger()
+
+    def action_reset(self):
+        self.write({
+            'state': 'draft',
+            'rows_done': 0,
+            'rows_updated': 0,
+            'rows_created': 0,
+            'rows_skipped': 0,
+            'error_log': False,
+        })
+
+    @api.model
+    def _cron_process_imports(self, time_limit=240):
+        """Process queued imports until time_limit seconds elapsed, then reschedule"""
+        deadline = time.monotonic() + time_limit
+        for imp in self.search([('state', 'in', ('queued', 'running'))], order='id'):
+            if not imp._process(deadline):
+                self.env.ref('employee_performance.ir_cron_process_counter_imports')._trigger()
+                return
+
+    def _process(self, deadline):
+        """Import remaining rows chunk by chunk, committing after each one.
+
+        Returns False when the deadline was reached before the end of the file.
+        """
+        self.ensure_one()
+        self.state = 'running'
+        self.env.cr.commit()
+        try:
+            rows = itertools.islice(self._iter_rows(), self.rows_done, None)
+            for chunk in split_every(max(self.chunk_size, 1), rows):
+                stats = self._import_chunk(chunk, offset=self.rows_done)
+                self.write({
+                    'rows_done': self.rows_done + len(chunk),
+                    'rows_updated': self.rows_updated + stats['updated'],
+                    'rows_created': self.rows_created + stats['created'],
+                    'rows_skipped': self.rows_skipped + len(stats['errors']),
+                    'error_log': self._append_errors(stats['errors']),
+                })
+                self.env.cr.commit()
+                _logger.info("Counter import %s: %s rows processed", self.name, self.rows_done)
+                # Keep memory flat: drop everything the chunk loaded
+                self.env.invalidate_all()
+                if time.monotonic() > deadline:
+                    return False
+        except Exception as e:
+            self.env.cr.rollback()
+            self.write({'state': 'failed', 'error_log': self._append_errors([str(e)])})
+            self.env.cr.commit()
+            _logger.exception("Counter import %s failed", self.name)
+            return True
+        self.state = 'done'
+        self.env['performance.bulk.run']._log(
+            'import', f"Counter import {self.name}", self.rows_done,
+            f"{self.rows_done} rows processed: {self.rows_updated} lines updated, "
+            f"{self.rows_created} lines created, {self.rows_skipped} rows skipped.")
+        self.env.cr.commit()
+        return True
+
+    def _append_errors(self, errors, max_lines=1000):
+        """Error log with errors appended, capped to max_lines lines"""
+        log = self.error_log.splitlines() if self.error_log else []
+        return '\n'.join((log + errors)[:max_lines]) or False
+
+    def _open_file(self):
+        """Binary stream over the uploaded file, read from the filestore when possible"""
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'data_file'),
+            ('res_id', '=', self.id),
+        ], limit=1)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        return io.BytesIO(attachment.raw or b'')
+
+    def _iter_rows(self):
+        """Yield the file's rows as dicts without loading the whole file"""
+        with self._open_file() as binary:
+            text = io.TextIOWrapper(binary, encoding='utf-8-sig')
+            if self.file_format == 'csv':
+                yield from csv.DictReader(text)
+            else:
+                for line in text:
+                    if line.strip():
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            # Yielded as is: reported and skipped by _import_chunk
+                            yield line.strip()
+
+    @api.model
+    def _import_chunk(self, rows, offset=0):
+        """Upsert counter rows matched on employee_code, objective name and timeline.
+
+        All lookups are done in bulk for the chunk, writes only set values in
+        the cache, and the achieved percentages are recomputed together when
+        the chunk is flushed. Rows without a line are added to the employee's
+        latest performance record. Malformed rows are skipped and reported.
+        """
+        Line = self.env['employee.performance.line'].with_context(skip_rollup_propagation=True)
+        errors = []
+
+        numbered_rows = []
+        for number, row in enumerate(rows, offset + 1):
+            if isinstance(row, dict):
+                numbered_rows.append((number, row))
+            else:
+                errors.append(f"Row {number}: expected an object, got {str(row)[:80]!r}")
+        rows = [row for number, row in numbered_rows]
+
+        codes = {str(row.get('employee_code') or '').strip() for row in rows} - {''}
+        objective_names = {str(row.get('objective') or '').strip() for row in rows} - {''}
+        employees = self.env['hr.employee'].search_fetch([('employee_code', 'in', list(codes))], ['employee_code'])
+        employee_by_code = {emp.employee_code: emp.id for emp in employees}
+        objectives = self.env['performance.objective'].search_fetch([('name', 'in', list(objective_names))], ['name'])
+        objective_by_name = {objective.name: objective.id for objective in objectives}
+
+        lines = Line.search_fetch([
+            ('performance_id.employee_id', 'in', employees.ids),
+            ('objective_id', 'in', objectives.ids),
+        ], ['performance_id', 'objective_id', 'timeline_from', 'timeline_to', 'achieved_percentage'], order='id')
+        line_by_key = {
+            (line.performance_id.employee_id.id, line.objective_id.id, line.timeline_from, line.timeline_to): line
+            for line in lines
+        }
+        latest_performance = {
+            employee.id: performance_id
+            for employee, performance_id in self.env['employee.performance']._read_group(
+                [('employee_id', 'in', employees.ids)], ['employee_id'], ['id:max'])
+        }
+
+        updates, creates = {}, {}
+        for number, row in numbered_rows:
+            code = str(row.get('employee_code') or '').strip()
+            objective = str(row.get('objective') or '').strip()
+            employee_id = employee_by_code.get(code)
+            objective_id = objective_by_name.get(objective)
+            if not employee_id or not objective_id:
+                errors.append(f"Row {number}: unknown employee {code!r} or objective {objective!r}")
+                continue
+            try:
+                timeline_from = fields.Date.to_date(row.get('timeline_from') or None) or False
+                timeline_to = fields.Date.to_date(row.get('timeline_to') or None) or False
+                vals = {
+                    fname: convert(row[fname])
+                    for fname, convert in COUNTER_FIELDS.items()
+                    if row.get(fname) not in (None, '')
+                }
+            except (ValueError, TypeError, AttributeError) as e:
+                errors.append(f"Row {number}: {e}")
+                continue
+
+            key = (employee_id, objective_id, timeline_from, timeline_to)
+            line = line_by_key.get(key)
+            if line:
+                updates.setdefault(line, {}).update(vals)
+            elif latest_performance.get(employee_id):
+                creates.setdefault(key, {
+                    'performance_id': latest_performance[employee_id],
+                    'objective_id': objective_id,
+                    'timeline_from': timeline_from,
+                    'timeline_to': timeline_to,
+                }).update(vals)
+            else:
+                errors.append(f"Row {number}: employee {code!r} has no performance record")
+
+        touched = Line.concat(*updates)
+        incremental = self.env['performance.aggregation']._is_incremental()
+        # Includes the linked KPI lines, recomputed from the touched lines
+        snapshot = touched._rollup_snapshot() if incremental else []
+        for line, vals in updates.items():
+            line.write(vals)
+        created = Line.create(list(creates.values()))
+        # Deferred recomputation: everything computed for the chunk at once
+        self.env.flush_all()
+        if incremental:
+            self.env['performance.aggregation']._propagate('employee.performance', {}, created._rollup_contributions())
+            touched._rollup_propagate(snapshot)
+
+        return {'updated': len(updates), 'created': len(created), 'errors': errors}
@@ -0,0 +1,147 @@
+import json
+import logging
+from datetime import timedelta
+
+from psycopg2 import errors
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class PerformanceDashboardSnapshot(models.Model):
+    _name = 'performance.dashboard.snapshot'
+    _description = 'Performance Dashboard Snapshot'
+    _order = 'id desc'
+
+    company_id = fields.Many2one('res.company', string='Company', required=True, index=True, ondelete='cascade')
+    key = fields.Char(string='Key', required=True, default='dashboard')
+    payload = fields.Json(string='Payload')
+    date = fields.Datetime(string='Computed On', required=True, default=fields.Datetime.now)
+    # Data version the payload was computed at, see _get_data_version()
+    data_version = fields.Integer(string='Data Version')
+
+    _company_key_uniq = models.UniqueIndex('(company_id, key)')
+
+    @api.model
+    def _get_ttl(self):
+        """Maximum snapshot age in seconds, 0 meaning only data changes expire it"""
+        return int(self.env['ir.config_parameter'].sudo().get_param('employee_performance.dashboard_ttl', 900))
+
+    @api.model
+    def _get_data_version(self):
+        """Version of the dashboard data as seen by the current transaction"""
+        self.env.cr.execute(SQL("SELECT COALESCE(max(id), 0) FROM performance_dashboard_change"))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _get_payload(self, key, compute, version=None):
+        """Return the snapshot payload for key, calling compute() when missing, outdated or expired.
+
+        When version matches the snapshot's current version token, the
+        payload itself is left out and 'unchanged' is set instead.
+        """
+        now = fields.Datetime.now()
+        company_id = self.env.company.id
+        data_version = self._get_data_version()
+        cr = self.env.cr
+        cr.execute(SQL(
+            "SELECT payload, date, data_version FROM performance_dashboard_snapshot WHERE company_id = %s AND key = %s",
+            company_id, key,
+        ))
+        row = cr.fetchone()
+        ttl = self._get_ttl()
+        if row and row[2] == data_version and not (ttl and row[1] < now - timedelta(seconds=ttl)):
+            payload, date = row[0], row[1]
+        else:
+            payload, date = compute(), now
+            self._store(company_id, key, payload, date, data_version)
+
+        generated_at = fields.Datetime.to_string(date)
+        info = {
+            'generated_at': generated_at,
+            'age_seconds': int((now - date).total_seconds()),
+            'version': f"{data_version}:{generated_at}",
+        }
+        if version == info['version']:
+            return {'snapshot': info, 'unchanged': True}
+        payload = dict(payload or {})
+        payload['snapshot'] = info
+        return payload
+
+    @api.model
+    def _store(self, company_id, key, payload, date, data_version):
+        """Upsert the snapshot of key, unless a concurrent transaction stored a newer one.
+
+        A snapshot is only a cache: losing the race to a concurrent reader is
+        not an error, so the upsert runs in a savepoint and conflicts are
+        ignored instead of failing the caller's transaction.
+        """
+        try:
+            with self.env.cr.savepoint(flush=False):
+                self.env.cr.execute(SQL(
+                    """
+                    INSERT INTO performance_dashboard_snapshot (company_id, key, payload, date, data_version)
+                    VALUES (%s, %s, %s::jsonb, %s, %s)
+                    ON CONFLICT (company_id, key) DO UPDATE
+                       SET payload = EXCLUDED.payload, date = EXCLUDED.date, data_version = EXCLUDED.data_version
+                     WHERE performance_dashboard_snapshot.data_version <= EXCLUDED.data_version
+                    """,
+                    company_id, key, json.dumps(payload), date, data_version,
+                ))
+        except errors.SerializationFailure:
+            _logger.debug("Dashboard snapshot %s was refreshed concurrently", key)
+        self.invalidate_model()
+
+    @api.model
+    def _invalidate(self):
+        """Bump the data version once, right before the current transaction commits.
+
+        The version is a row inserted in an append-only table: it becomes
+        visible together with the data changes, and concurrent writers never
+        update or delete the same rows.
+        """
+        if self.env.context.get('performance_defer_invalidation'):
+            # Aggregation partitions: their job invalidates once when it completes
+            return
+        precommit = self.env.cr.precommit
+        if not precommit.data.get(self._name):
+            precommit.data[self._name] = True
+            precommit.add(self._bump_data_version)
+
+    def _bump_data_version(self):
+        self.env.cr.execute(SQL("INSERT INTO performance_dashboard_change DEFAULT VALUES"))
+
+
+class PerformanceDashboardChange(models.Model):
+    _name = 'performance.dashboard.change'
+    _description = 'Dashboard Data Change'
+    _log_access = False
+
+    @api.autovacuum
+    def _gc_changes(self):
+        """Only the latest change matters: drop the older ones"""
+        self.env.cr.execute(SQL(
+            "DELETE FROM performance_dashboard_change WHERE id < (SELECT max(id) FROM performance_dashboard_change)"
+        ))
+
+
+class PerformanceDashboardSource(models.AbstractModel):
+    _name = 'performance.dashboard.source'
+    _description = 'Dashboard Data Source'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['performance.dashboard.snapshot']._invalidate()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env['performance.dashboard.snapshot']._invalidate()
+        return res
+
+    def unlink(self):
+        self.env['performance.dashboard.snapshot']._invalidate()
+        return super().unlink()
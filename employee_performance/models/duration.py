@@ -0,0 +1,15 @@
+import functools
+
+
+@functools.lru_cache(maxsize=4096)
+def format_duration(date_from, date_to):
+    """Human readable span between two dates, computed once per distinct pair"""
+    delta = date_to - date_from
+    years = delta.days // 365
+    months = (delta.days % 365) // 30
+    days = (delta.days % 365) % 30
+    if years > 0:
+        return f"{years} years {months} months {days} days"
+    elif months > 0:
+        return f"{months} months {days} days"
+    return f"{days} days"
@@ -1,11 +1,23 @@
 from odoo import models, fields, api
-from datetime import date
+from odoo.tools import SQL
+
+from .duration import format_duration
+from .telemetry import profiled
 
 class HrEmployeeInherit(models.Model):
     _inherit = 'hr.employee'
+    # Materialized path of supervisor ids ("1/5/9/"), maintained by the ORM
+    # whenever parent_id changes: a whole subtree is one prefix match
+    _parent_store = True
 
     # Change label from Manager to Supervisor
     parent_id = fields.Many2one('hr.employee', string='Supervisor', index=True, ondelete='set null')
+    parent_path = fields.Char(string='Hierarchy Path')
+
+    # Prefix searches (LIKE '1/5/%') need pattern operators to use a btree
+    _parent_path_idx = models.Index('(parent_path varchar_pattern_ops)')
+    # Keyset cursor of the BI API's incremental pulls
+    _write_date_id_idx = models.Index('(write_date, id)')
     
     # New field for team members
     team_member_ids = fields.One2many(
@@ -28,68 +40,129 @@ class HrEmployeeInherit(models.Model):
     joining_date = fields.Date(string='Date of Joining')
     length_of_service = fields.Char(string='Length of Service', compute='_compute_length_of_service', store=True)
 
-    # Overall rating from KPI
-    overall_rating = fields.Float(string='Overall Rating', compute='_compute_overall_rating', store=True)
+    # Overall rating from the latest KPI, kept current by the ORM
+    kpi_ids = fields.One2many('employee.kpi', 'employee_id', string='KPIs')
+    latest_kpi_id = fields.Many2one('employee.kpi', string='Latest KPI', compute='_compute_latest_kpi', store=True)
+    overall_rating = fields.Float(string='Overall Rating', related='latest_kpi_id.overall_rating', store=True)
+    level_rank = fields.Integer(related='latest_kpi_id.level_rank')
+    level_percentile = fields.Float(related='latest_kpi_id.level_percentile')
+
+    # Background aggregation of the subtree below the employee
+    aggregation_job_ids = fields.One2many('performance.aggregation.job', 'employee_id', string='Aggregation Jobs',
+                                          domain=[('parent_id', '=', False)])
+    aggregation_job_id = fields.Many2one('performance.aggregation.job', string='Last Aggregation', compute='_compute_aggregation_job')
+    aggregation_state = fields.Selection(related='aggregation_job_id.state', string='Aggregation Status')
+    aggregation_progress = fields.Float(related='aggregation_job_id.progress', string='Aggregation Progress')
 
     @api.depends('joining_date')
     def _compute_length_of_service(self):
+        # Relative to today: kept current by the nightly _cron_refresh_length_of_service
+        today = fields.Date.today()
+        for rec in self:
+            rec.length_of_service = format_duration(rec.joining_date, today) if rec.joining_date else ''
+
+    @api.model
+    def _cron_refresh_length_of_service(self):
+        """Rewrite length_of_service where it changed since yesterday, in one set-based pass.
+
+        Employees are grouped by (joining date, stored value): the duration is
+        formatted once per joining date and only stale rows are updated.
+        """
+        today = fields.Date.today()
+        self.env.flush_all()
+        cr = self.env.cr
+        cr.execute(SQL(
+            """
+            SELECT joining_date, length_of_service, array_agg(id)
+              FROM hr_employee
+             WHERE joining_date IS NOT NULL
+          GROUP BY joining_date, length_of_service
+            """
+        ))
+        ids, values = [], []
+        for joining_date, current, employee_ids in cr.fetchall():
+            value = format_duration(joining_date, today)
+            if value != current:
+                ids.extend(employee_ids)
+                values.extend([value] * len(employee_ids))
+        if not ids:
+            return
+        cr.execute(SQL(
+            """
+            UPDATE hr_employee e
+               SET length_of_service = v.value,
+                   write_date = (now() at time zone 'UTC'),
+                   write_uid = %s
+              FROM unnest(%s::int[], %s::varchar[]) AS v(id, value)
+             WHERE e.id = v.id
+            """,
+            self.env.uid, ids, values,
+        ))
+        # write_date moved: incremental consumers (BI API) pick the rows up
+        self.invalidate_model(['length_of_service', 'write_date', 'write_uid'])
+
+    @api.depends('kpi_ids')
+    def _compute_latest_kpi(self):
+        """Link each employee to their most recent KPI record, in one grouped query"""
+        latest = dict(self.env['employee.kpi'].sudo()._read_group(
+            [('employee_id', 'in', self._origin.ids)], ['employee_id'], ['id:max']))
         for rec in self:
-            if rec.joining_date:
-                delta = date.today() - rec.joining_date
-                years = delta.days // 365
-                months = (delta.days % 365) // 30
-                days = (delta.days % 365) % 30
-                if years > 0:
-                    rec.length_of_service = f"{years} years {months} months {days} days"
-                elif months > 0:
-                    rec.length_of_service = f"{months} months {days} days"
-                else:
-                    rec.length_of_service = f"{days} days"
-            else:
-                rec.length_of_service = ''
-
-    @api.depends()
-    def _compute_overall_rating(self):
-        """Compute overall rating from KPI records"""
+            rec.latest_kpi_id = latest.get(rec._origin, False)
+
+    @api.depends('aggregation_job_ids')
+    def _compute_aggregation_job(self):
+        latest = dict(self.env['performance.aggregation.job'].sudo()._read_group(
+            [('employee_id', 'in', self._origin.ids), ('parent_id', '=', False)], ['employee_id'], ['id:max']))
         for rec in self:
-            # Search for the latest KPI record for this employee
-            kpi_record = self.env['employee.kpi'].search([
-                ('employee_id', '=', rec.id)
-            ], order='create_date desc', limit=1)
-            
-            if kpi_record and kpi_record.overall_rating > 0:
-                rec.overall_rating = kpi_record.overall_rating
-            else:
-                rec.overall_rating = 0.0
-                
+            rec.aggregation_job_id = latest.get(rec._origin, False)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super().create(vals_list)
+        # New supervisors' achievements are aggregated from now on
+        self.env['employee.kpi.line']._unlink_supervisor_lines(employees.parent_id)
+        return employees
+
+    def write(self, vals):
+        if 'parent_id' in vals:
+            # Cached subordinate totals of the old and new supervisors are now wrong
+            supervisors = self.parent_id | self.browse(vals['parent_id'] or [])
+            self.env['performance.aggregation.node']._invalidate(employees=supervisors)
+        res = super().write(vals)
+        if vals.get('parent_id'):
+            self.env['employee.kpi.line']._unlink_supervisor_lines(self.parent_id)
+        return res
+
+    def get_subtree_achievement(self, model_name='employee.performance'):
+        """Average positive achievement per objective across everyone under the employee.
+
+        Returns {objective_id: {'average': float, 'count': int}}; one indexed
+        query whatever the depth of the org.
+        """
+        self.ensure_one()
+        return self.env['performance.aggregation'].subtree_achievement(self, model_name)[self.id]
+
     def _compute_team_members(self):
         """Auto compute team members from child_ids"""
         for rec in self:
             rec.team_member_ids = rec.child_ids
 
+    @profiled('hr.employee.action_aggregate_subordinates')
     def action_aggregate_subordinates(self):
-        """Called when Supervisor clicks 'Checked' button to aggregate from children"""
-        Performance = self.env['employee.performance']
-        KPI = self.env['employee.kpi']
-        
-        for emp in self:
-            # Aggregate performance records
-            parent_perfs = Performance.search([('employee_id', '=', emp.id)])
-            for p in parent_perfs:
-                p.aggregate_from_children()
-            
-            # Aggregate KPI records
-            parent_kpis = KPI.search([('employee_id', '=', emp.id)])
-            for k in parent_kpis:
-                k.aggregate_from_children()
-                
+        """Called when Supervisor clicks 'Checked' button to aggregate from children.
+
+        The subtree is aggregated by a background job, chunk by chunk; its
+        progress is shown on the employee form.
+        """
+        self.env['performance.aggregation.job']._enqueue(self)
+
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
-                'title': 'Aggregation Complete',
-                'message': 'Subordinates data has been aggregated successfully.',
-                'type': 'success',
+                'title': 'Aggregation Queued',
+                'message': 'Subordinates data is being aggregated in the background.',
+                'type': 'info',
                 'sticky': False,
             }
         }
\ No newline at end of file
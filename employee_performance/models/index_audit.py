@@ -0,0 +1,133 @@
+import json
+import logging
+
+from odoo import models, api
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class PerformanceIndexAudit(models.AbstractModel):
+    _name = 'performance.index.audit'
+    _description = 'Performance Index Audit'
+
+    @api.model
+    def _run(self, employees=2000, records_per_employee=3, objectives=10, populate=True):
+        """EXPLAIN the module's hot lookups and report which indexes they use.
+
+        With populate, a synthetic dataset is inserted first so the planner
+        sees realistic table sizes; everything is rolled back afterwards.
+        Meant to be run from a shell: env['performance.index.audit']._run()
+        """
+        savepoint = self.env.cr.savepoint()
+        try:
+            if populate:
+                self._populate(employees, records_per_employee, objectives)
+            report = [self._explain(label, query) for label, query in self._hot_queries()]
+        finally:
+            savepoint.close(rollback=True)
+            self.env.invalidate_all()
+
+        for entry in report:
+            _logger.info("Index audit %s: index scans %s, sequential scans %s",
+                         entry['label'], entry['index_scans'], entry['seq_scans'])
+        return report
+
+    @api.model
+    def _hot_queries(self):
+        """Representative lookups of the module, as (label, Query) built by the ORM"""
+        Perf = self.env['employee.performance']
+        KPI = self.env['employee.kpi']
+        employee_ids = self.env['hr.employee'].search([], limit=20).ids
+        objective = self.env['performance.objective'].search([], limit=1)
+        level = self.env['performance.level'].search([], limit=1)
+        return [
+            ('performance lines of subordinates', self.env['employee.performance.line']._search([
+                ('performance_id.employee_id', 'in', employee_ids),
+                ('objective_id', '=', objective.id),
+                ('achieved_percentage', '>', 0),
+            ])),
+            ('KPI lines of subordinates', self.env['employee.kpi.line']._search([
+                ('kpi_id.employee_id', 'in', employee_ids),
+                ('objective_id', '=', objective.id),
+                ('achieved_percentage', '>', 0),
+            ])),
+            ('subtree of an employee', self.env['hr.employee']._search(
+                [('id', 'child_of', employee_ids[:1])])),
+            ('performance records per employee', Perf._search([('employee_id', 'in', employee_ids)])),
+            ('latest KPI of an employee', KPI._search(
+                [('employee_id', 'in', employee_ids[:1])], order='id desc', limit=1)),
+            ('performance records per level and state', Perf._search(
+                [('level_id', '=', level.id), ('state', '=', 'draft')])),
+            ('KPI records per level and state', KPI._search(
+                [('level_id', '=', level.id), ('state', '=', 'draft')])),
+        ]
+
+    @api.model
+    def _explain(self, label, query):
+        self.env.cr.execute(SQL("EXPLAIN (FORMAT JSON) %s", query.select()))
+        plan = self.env.cr.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        index_scans, seq_scans = [], []
+        nodes = [plan[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            if 'Index Name' in node:
+                index_scans.append(node['Index Name'])
+            elif node['Node Type'] == 'Seq Scan':
+                seq_scans.append(node['Relation Name'])
+            nodes.extend(node.get('Plans', []))
+        return {
+            'label': label,
+            'index_scans': index_scans,
+            'seq_scans': seq_scans,
+            'plan': plan,
+        }
+
+    @api.model
+    def _populate(self, employees, records_per_employee, objectives):
+        """Insert a synthetic dataset: employees through the ORM, records and lines in bulk SQL"""
+        company = self.env.company
+        employee_ids = self.env['hr.employee'].create([
+            {'name': f"Audit Employee {i}", 'company_id': company.id} for i in range(employees)
+        ]).ids
+        objective_ids = self.env['performance.objective'].create([
+            {'name': f"Audit Objective {i}"} for i in range(objectives)
+        ]).ids
+        level = self.env['performance.level'].create({'name': 'Audit Level'})
+        self.env.flush_all()
+
+        cr = self.env.cr
+        for table, prefix in (('employee_performance', 'Perf'), ('employee_kpi', 'KPI')):
+            cr.execute(SQL(
+                """
+                INSERT INTO %(table)s (name, employee_id, level_id, state, create_date, write_date)
+                SELECT %(prefix)s || e.id, e.id, %(level)s,
+                       (ARRAY['draft', 'checked', 'confirmed', 'done'])[1 + (n %% 4)],
+                       now(), now()
+                  FROM unnest(%(employees)s) AS e(id), generate_series(1, %(count)s) AS n
+                """,
+                table=SQL.identifier(table), prefix=f"{prefix}/Audit/", level=level.id,
+                employees=employee_ids, count=records_per_employee,
+            ))
+        for table, link, parent_table in (
+            ('employee_performance_line', 'performance_id', 'employee_performance'),
+            ('employee_kpi_line', 'kpi_id', 'employee_kpi'),
+        ):
+            cr.execute(SQL(
+                """
+                INSERT INTO %(table)s (%(link)s, objective_id, achieved_percentage, create_date, write_date)
+                SELECT r.id, o.id, (random() * 120)::numeric(5, 2), now(), now()
+                  FROM %(parent_table)s r, unnest(%(objectives)s) AS o(id)
+                 WHERE r.employee_id = ANY(%(employees)s)
+                """,
+                table=SQL.identifier(table), link=SQL.identifier(link),
+                parent_table=SQL.identifier(parent_table),
+                objectives=objective_ids, employees=employee_ids,
+            ))
+        cr.execute(SQL("UPDATE employee_performance_line l SET level_id = p.level_id"
+                       " FROM employee_performance p WHERE p.id = l.performance_id AND l.level_id IS NULL"))
+        for table in ('employee_performance', 'employee_performance_line', 'employee_kpi', 'employee_kpi_line'):
+            cr.execute(SQL("ANALYZE %s", SQL.identifier(table)))
@@ -1,17 +1,20 @@
 from odoo import models, fields, api
+from odoo.tools import split_every
+
+from .telemetry import profiled
 
 class EmployeeKPI(models.Model):
     _name = 'employee.kpi'
     _description = 'Employee KPI'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'performance.dashboard.source']
     _order = 'id desc'
 
     # Name field with employee name format
     name = fields.Char(string='Reference', readonly=True, copy=False, default='New')
     
-    employee_id = fields.Many2one('hr.employee', string='Employee Name', required=True)
+    employee_id = fields.Many2one('hr.employee', string='Employee Name', required=True, index=True)
     supervisor_id = fields.Many2one('hr.employee', string='Supervisor', compute='_compute_supervisor', store=True)
-    level_id = fields.Many2one('performance.level', string='Level Name', required=True)
+    level_id = fields.Many2one('performance.level', string='Level Name', required=True, index=True)
     
     # KPI lines
     kpi_line_ids = fields.One2many('employee.kpi.line', 'kpi_id', string='KPI Lines')
@@ -19,6 +22,11 @@ class EmployeeKPI(models.Model):
     # Overall calculations
     total_weightage = fields.Float(string='Total Weightage', compute='_compute_totals', store=True)
     overall_rating = fields.Float(string='Overall Rating', compute='_compute_totals', store=True)
+
+    # Standing within the level, refreshed by the nightly analytics job
+    level_rank = fields.Integer(string='Rank in Level', readonly=True, copy=False)
+    level_percentile = fields.Float(string='Percentile in Level', readonly=True, copy=False)
+    rating_zscore = fields.Float(string='Rating Z-Score', readonly=True, copy=False)
     
     # State
     state = fields.Selection([
@@ -26,20 +34,25 @@ class EmployeeKPI(models.Model):
         ('checked','Checked'),
         ('confirmed','Confirmed'),
         ('done','Done')
-    ], default='draft', string='Status')
+    ], default='draft', string='Status', index=True)
 
     # Comments
     comments_reviews = fields.Html(string='Comments/Reviews')
 
+    # Latest KPI per employee (hr.employee.latest_kpi_id) and per-level lookups
+    _employee_latest_idx = models.Index('(employee_id, id DESC)')
+    _level_state_idx = models.Index('(level_id, state)')
+
     @api.model_create_multi
     def create(self, vals_list):
+        # Read all employee names in one query
+        employee_ids = [vals['employee_id'] for vals in vals_list if vals.get('employee_id')]
+        names = {employee.id: employee.name for employee in self.env['hr.employee'].browse(employee_ids)}
         for vals in vals_list:
             if vals.get('name', 'New') == 'New':
-                # Get employee name
                 employee_id = vals.get('employee_id')
                 if employee_id:
-                    employee = self.env['hr.employee'].browse(employee_id)
-                    vals['name'] = f"KPI/{employee.name}"
+                    vals['name'] = f"KPI/{names[employee_id]}"
                 else:
                     vals['name'] = "KPI/New"
         return super().create(vals_list)
@@ -50,32 +63,39 @@ class EmployeeKPI(models.Model):
             rec.supervisor_id = rec.employee_id.parent_id
 
     @api.onchange('level_id')
+    @profiled('employee.kpi._onchange_level_id')
     def _onchange_level_id(self):
         """Auto-create KPI lines based on level objectives"""
         if self.level_id and self.level_id.objective_line_ids:
             # Clear existing lines
             self.kpi_line_ids = [(5, 0, 0)]
             
-            # Create new lines from level objectives
-            lines = []
-            for objective_line in self.level_id.objective_line_ids:
-                # Get achieved percentage from performance records
-                achieved_percentage = 0.0
-                performance_line = self.env['employee.performance.line'].search([
-                    ('performance_id.employee_id', '=', self.employee_id.id),
-                    ('objective_id', '=', objective_line.objective_id.id)
-                ], limit=1)
-                
-                if performance_line:
-                    achieved_percentage = performance_line.achieved_percentage
-                
-                lines.append((0, 0, {
-                    'objective_id': objective_line.objective_id.id,
-                    'achieved_percentage': achieved_percentage,
-                    'weightage': 0.0,
-                    'rating': 0.0,
-                }))
-            self.kpi_line_ids = lines
+            # Create new lines from level objectives, linked to the matching performance lines
+            performance_lines = self._get_performance_lines(self.employee_id, self.level_id.objective_line_ids.objective_id)
+            self.kpi_line_ids = [
+                (0, 0, vals) for vals in self.level_id._prepare_kpi_line_vals(self.employee_id, performance_lines)
+            ]
+
+    @api.model
+    def _get_performance_lines(self, employees, objectives):
+        """Latest performance line id per (employee id, objective id), in one query.
+
+        Supervisors are left out: the aggregation owns the achievement of
+        their KPI lines, which must not follow their own performance lines.
+        """
+        lines = self.env['employee.performance.line'].search_fetch([
+            ('performance_id.employee_id', 'in', employees.ids),
+            ('performance_id.employee_id.child_ids', '=', False),
+            ('objective_id', 'in', objectives.ids),
+        ], ['performance_id', 'objective_id'], order='id')
+        return {
+            (line.performance_id.employee_id.id, line.objective_id.id): line.id
+            for line in lines
+        }
+
+    def action_link_performance_lines(self):
+        """Link the KPI lines of these records to their matching performance lines"""
+        self.kpi_line_ids._link_performance_lines()
 
     @api.depends('kpi_line_ids.weightage', 'kpi_line_ids.final_rating')
     def _compute_totals(self):
@@ -83,49 +103,83 @@ class EmployeeKPI(models.Model):
             rec.total_weightage = sum(rec.kpi_line_ids.mapped('weightage'))
             rec.overall_rating = sum(rec.kpi_line_ids.mapped('final_rating'))
 
+    @profiled('employee.kpi.aggregate_from_children')
     def aggregate_from_children(self):
-        """Bottom-up aggregation from child employees"""
-        for rec in self:
-            employee = rec.employee_id
-            child_emps = self.env['hr.employee'].search([('parent_id', '=', employee.id)])
-            
-            if not child_emps:
-                continue
-                
-            for kpi_line in rec.kpi_line_ids:
-                # Find matching child KPI records
-                child_kpi_lines = self.env['employee.kpi.line'].search([
-                    ('kpi_id.employee_id', 'in', child_emps.ids),
-                    ('objective_id', '=', kpi_line.objective_id.id),
-                    ('achieved_percentage', '>', 0)
-                ])
-                
-                if child_kpi_lines:
-                    # Calculate average achieved percentage
-                    total_achieved = sum(line.achieved_percentage for line in child_kpi_lines)
-                    avg_achieved = total_achieved / len(child_kpi_lines)
-                    kpi_line.achieved_percentage = round(avg_achieved, 2)
-            
-            # Mark as checked
-            rec.state = 'checked'
+        """Bottom-up aggregation from child employees, returns the records marked as checked"""
+        return self.env['performance.aggregation'].aggregate_records(self)
 
+    @profiled('employee.kpi.action_mark_checked')
     def action_mark_checked(self):
         """Manual check button"""
-        self.aggregate_from_children()
-        self.state = 'checked'
+        checked = self.aggregate_from_children()
+        # Records without subordinates were not marked by the aggregation
+        if self - checked:
+            (self - checked).write({'state': 'checked'})
 
 
 class EmployeeKPILine(models.Model):
     _name = 'employee.kpi.line'
     _description = 'Employee KPI Line'
+    _inherit = ['performance.dashboard.source', 'performance.rollup.line']
+    _rollup_model = 'employee.kpi'
 
-    kpi_id = fields.Many2one('employee.kpi', string='KPI', required=True, ondelete='cascade')
-    objective_id = fields.Many2one('performance.objective', string='Objective', required=True)
-    achieved_percentage = fields.Float(string='Achieve Percentage')
+    kpi_id = fields.Many2one('employee.kpi', string='KPI', required=True, index=True, ondelete='cascade')
+    objective_id = fields.Many2one('performance.objective', string='Objective', required=True, index=True)
+    # Achievement follows the performance line through the ORM's dependencies.
+    # Supervisors' lines are never linked: their value is written by the
+    # aggregation, like that of lines without a matching performance line
+    performance_line_id = fields.Many2one('employee.performance.line', string='Performance Line',
+                                          index='btree_not_null', ondelete='set null')
+    achieved_percentage = fields.Float(string='Achieve Percentage', compute='_compute_achieved_percentage',
+                                       store=True, readonly=False)
     weightage = fields.Float(string='Weightage (%)')
     rating = fields.Float(string='Rating')
     final_rating = fields.Float(string='Final Rating', compute='_compute_final_rating', store=True)
 
+    # Child lookups filter on objective and KPI record, mostly achieved > 0
+    _objective_kpi_idx = models.Index('(objective_id, kpi_id) WHERE achieved_percentage > 0')
+    # Keyset cursor of the BI API's incremental pulls
+    _write_date_id_idx = models.Index('(write_date, id)')
+
+    @api.depends('performance_line_id.achieved_percentage')
+    def _compute_achieved_percentage(self):
+        for rec in self:
+            if rec.performance_line_id:
+                rec.achieved_percentage = rec.performance_line_id.achieved_percentage
+
+    def _link_performance_lines(self):
+        """Resolve the performance line of lines without one, in bulk"""
+        lines = self.filtered(lambda line: not line.performance_line_id)
+        performance_lines = self.env['employee.kpi']._get_performance_lines(
+            lines.kpi_id.employee_id, lines.objective_id)
+        line_ids_by_target = {}
+        for line in lines:
+            target = performance_lines.get((line.kpi_id.employee_id.id, line.objective_id.id))
+            if target:
+                line_ids_by_target.setdefault(target, []).append(line.id)
+        for target, line_ids in line_ids_by_target.items():
+            lines.browse(line_ids).write({'performance_line_id': target})
+
+    @api.model
+    def _link_all_performance_lines(self, batch_size=1000):
+        """Detach every supervisor's KPI line and link all the others, in batches"""
+        supervisors = self.env['hr.employee'].search([('child_ids', '!=', False)])
+        self._unlink_supervisor_lines(supervisors)
+        lines = self.search([('performance_line_id', '=', False)], order='id')
+        for batch in split_every(batch_size, lines.ids, self.browse):
+            batch._link_performance_lines()
+
+    @api.model
+    def _unlink_supervisor_lines(self, employees):
+        """Detach the KPI lines of those of employees who now have subordinates"""
+        lines = self.search([
+            ('kpi_id.employee_id', 'in', employees.ids),
+            ('kpi_id.employee_id.child_ids', '!=', False),
+            ('performance_line_id', '!=', False),
+        ])
+        if lines:
+            lines.write({'performance_line_id': False})
+
     @api.depends('weightage', 'rating')
     def _compute_final_rating(self):
         for rec in self:
@@ -1,19 +1,76 @@
 from odoo import models, fields, api
 from odoo.exceptions import UserError
+from odoo.tools import SQL, float_round
+
+from .telemetry import profiled
+
+# Achievement formulas keyed by the objective type (flag) that enables them, in
+# the order they are tried: the first enabled formula whose guard holds wins.
+# Each entry is (guard, value) as Python callables on a line, then the same
+# guard and value as SQL over the line alias "l" for bulk recomputation.
+ACHIEVEMENT_FORMULAS = {
+    'show_job_completed': (
+        lambda line: line.number_of_wo > 0,
+        lambda line: line.number_of_job_completed / float(line.number_of_wo) * 100.0,
+        "COALESCE(l.number_of_wo, 0) > 0",
+        "COALESCE(l.number_of_job_completed, 0)::float / l.number_of_wo * 100.0",
+    ),
+    'show_job_fixed': (
+        lambda line: line.number_of_wo > 0,
+        lambda line: line.number_of_job_fixed_single_visit / float(line.number_of_wo) * 100.0,
+        "COALESCE(l.number_of_wo, 0) > 0",
+        "COALESCE(l.number_of_job_fixed_single_visit, 0)::float / l.number_of_wo * 100.0",
+    ),
+    'show_presence_schedule': (
+        lambda line: line.number_of_job_scheduled > 0,
+        lambda line: line.number_of_job_attend / float(line.number_of_job_scheduled) * 100.0,
+        "COALESCE(l.number_of_job_scheduled, 0) > 0",
+        "COALESCE(l.number_of_job_attend, 0)::float / l.number_of_job_scheduled * 100.0",
+    ),
+    'show_service_reports': (
+        lambda line: line.number_of_job_completed > 0,
+        lambda line: line.number_of_job_submitted / float(line.number_of_job_completed) * 100.0,
+        "COALESCE(l.number_of_job_completed, 0) > 0",
+        "COALESCE(l.number_of_job_submitted, 0)::float / l.number_of_job_completed * 100.0",
+    ),
+    'show_safety_incidents': (
+        lambda line: line.number_of_job_opportunities > 0,
+        lambda line: (line.number_of_job_opportunities - line.number_of_incidents) / float(line.number_of_job_opportunities) * 100.0,
+        "COALESCE(l.number_of_job_opportunities, 0) > 0",
+        "(l.number_of_job_opportunities - COALESCE(l.number_of_incidents, 0))::float"
+        " / l.number_of_job_opportunities * 100.0",
+    ),
+    'show_quality_score': (
+        lambda line: True,
+        lambda line: line.achieve_rating / 5.0 * 100.0,
+        "TRUE",
+        "COALESCE(l.achieve_rating, 0) / 5.0 * 100.0",
+    ),
+    'show_revenue': (
+        lambda line: line.previous_year_revenue > 0,
+        lambda line: ((line.current_year_revenue - line.previous_year_revenue) / line.previous_year_revenue * 100.0
+                      if line.current_year_revenue else 0.0),
+        "COALESCE(l.previous_year_revenue, 0) > 0",
+        "CASE WHEN COALESCE(l.current_year_revenue, 0) <> 0"
+        " THEN (l.current_year_revenue - l.previous_year_revenue) / l.previous_year_revenue * 100.0"
+        " ELSE 0 END",
+    ),
+}
+
 
 class EmployeePerformance(models.Model):
     _name = 'employee.performance'
     _description = 'Employee Performance'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'performance.dashboard.source']
     _order = 'id desc'
 
     # Name field with employee name format
     name = fields.Char(string='Reference', readonly=True, copy=False, default='New')
     
     # Basic references
-    employee_id = fields.Many2one('hr.employee', string='Employee Name', required=True, tracking=True)
+    employee_id = fields.Many2one('hr.employee', string='Employee Name', required=True, index=True, tracking=True)
     supervisor_id = fields.Many2one('hr.employee', string='Supervisor', compute='_compute_supervisor', store=True)
-    level_id = fields.Many2one('performance.level', string='Level Name', required=True, tracking=True)
+    level_id = fields.Many2one('performance.level', string='Level Name', required=True, index=True, tracking=True)
     
     # State
     state = fields.Selection([
@@ -21,20 +78,23 @@ class EmployeePerformance(models.Model):
         ('checked','Checked'),
         ('confirmed','Confirmed'),
         ('done','Done')
-    ], default='draft', string='Status', tracking=True)
+    ], default='draft', string='Status', index=True, tracking=True)
     
     # Performance lines (one per objective)
     performance_line_ids = fields.One2many('employee.performance.line', 'performance_id', string='Performance Lines')
 
+    _level_state_idx = models.Index('(level_id, state)')
+
     @api.model_create_multi
     def create(self, vals_list):
+        # Read all employee names in one query
+        employee_ids = [vals['employee_id'] for vals in vals_list if vals.get('employee_id')]
+        names = {employee.id: employee.name for employee in self.env['hr.employee'].browse(employee_ids)}
         for vals in vals_list:
             if vals.get('name', 'New') == 'New':
-                # Get employee name
                 employee_id = vals.get('employee_id')
                 if employee_id:
-                    employee = self.env['hr.employee'].browse(employee_id)
-                    vals['name'] = f"Perf/{employee.name}"
+                    vals['name'] = f"Perf/{names[employee_id]}"
                 else:
                     vals['name'] = "Perf/New"
         return super().create(vals_list)
@@ -45,6 +105,7 @@ class EmployeePerformance(models.Model):
             rec.supervisor_id = rec.employee_id.parent_id
 
     @api.onchange('level_id')
+    @profiled('employee.performance._onchange_level_id')
     def _onchange_level_id(self):
         """Auto-create performance lines based on level objectives"""
         if self.level_id and self.level_id.objective_line_ids:
@@ -52,118 +113,169 @@ class EmployeePerformance(models.Model):
             self.performance_line_ids = [(5, 0, 0)]
             
             # Create new lines from level objectives
-            lines = []
-            for objective_line in self.level_id.objective_line_ids:
-                lines.append((0, 0, {
-                    'objective_id': objective_line.objective_id.id,
-                    'target_percentage': objective_line.target_percentage,
-                    'timeline_from': objective_line.timeline_from,
-                    'timeline_to': objective_line.timeline_to,
-                }))
-            self.performance_line_ids = lines
+            self.performance_line_ids = [(0, 0, vals) for vals in self.level_id._prepare_performance_line_vals()]
 
+    @profiled('employee.performance.aggregate_from_children')
     def aggregate_from_children(self):
-        """Bottom-up aggregation from child employees"""
-        for rec in self:
-            employee = rec.employee_id
-            child_emps = self.env['hr.employee'].search([('parent_id', '=', employee.id)])
-            
-            if not child_emps:
-                continue
-                
-            for perf_line in rec.performance_line_ids:
-                # Find matching child performance records
-                child_perf_lines = self.env['employee.performance.line'].search([
-                    ('performance_id.employee_id', 'in', child_emps.ids),
-                    ('objective_id', '=', perf_line.objective_id.id),
-                    ('achieved_percentage', '>', 0)
-                ])
-                
-                if child_perf_lines:
-                    # Calculate average achieved percentage
-                    total_achieved = sum(line.achieved_percentage for line in child_perf_lines)
-                    avg_achieved = total_achieved / len(child_perf_lines)
-                    perf_line.achieved_percentage = round(avg_achieved, 2)
-            
-            # Mark as checked
-            rec.state = 'checked'
+        """Bottom-up aggregation from child employees, returns the records marked as checked"""
+        return self.env['performance.aggregation'].aggregate_records(self)
 
+    @profiled('employee.performance.action_mark_checked')
     def action_mark_checked(self):
         """Manual check button"""
-        self.aggregate_from_children()
-        self.state = 'checked'
+        checked = self.aggregate_from_children()
+        # Records without subordinates were not marked by the aggregation
+        if self - checked:
+            (self - checked).write({'state': 'checked'})
     
+    # Sortable columns of the dashboard details table
+    _DASHBOARD_DETAIL_ORDERS = ('employee_id', 'level_id', 'overall_rating', 'level_rank', 'state', 'id')
+
     @api.model
+    @profiled('employee.performance.get_dashboard_data')
     def get_dashboard_data(self):
-        """Return summarized metrics for the JS dashboard"""
-        env = self.env
-        
-        # Get all levels and their performance
-        levels = env['performance.level'].search([])
-        level_data = {}
-        
-        for level in levels:
-            # Get performance records for this level
-            perfs = self.search([('level_id', '=', level.id)])
-            if perfs:
-                total_achieved = sum(perfs.performance_line_ids.mapped('achieved_percentage'))
-                avg_achieved = total_achieved / len(perfs.performance_line_ids) if perfs.performance_line_ids else 0
-                level_data[level.name.lower().replace(' ', '_')] = round(avg_achieved, 2)
-        
-        # Calculate TST Overall Rating
-        tst_kpis = env['employee.kpi'].search([('level_id.name', 'ilike', 'TST Individual')])
-        tst_overall_rating = 0.0
-        if tst_kpis:
-            tst_overall_rating = round(sum(tst_kpis.mapped('overall_rating')) / len(tst_kpis), 1)
-        
-        # Calculate PM Overall Rating
-        pm_kpis = env['employee.kpi'].search([('level_id.name', 'ilike', 'PM Individual')])
-        pm_overall_rating = 0.0
-        if pm_kpis:
-            pm_overall_rating = round(sum(pm_kpis.mapped('overall_rating')) / len(pm_kpis), 1)
-        
-        # Get KPI data for dashboard
-        kpi_data = []
-        kpi_records = env['employee.kpi'].search([], limit=10)
+        """Return summarized metrics for the JS dashboard, served from the company snapshot"""
+        return self.env['performance.dashboard.snapshot']._get_payload('dashboard', self._compute_dashboard_data)
+
+    # Per-card endpoints: each card is cached in its own snapshot and carries
+    # a version token; passing back the last token skips an unchanged payload
+
+    @api.model
+    @profiled('employee.performance.get_dashboard_levels')
+    def get_dashboard_levels(self, version=None):
+        return self.env['performance.dashboard.snapshot']._get_payload(
+            'levels', self._compute_dashboard_levels, version=version)
+
+    @api.model
+    @profiled('employee.performance.get_dashboard_ratings')
+    def get_dashboard_ratings(self, version=None):
+        return self.env['performance.dashboard.snapshot']._get_payload(
+            'ratings', self._compute_dashboard_ratings, version=version)
+
+    @api.model
+    @profiled('employee.performance.get_dashboard_summary')
+    def get_dashboard_summary(self, version=None):
+        return self.env['performance.dashboard.snapshot']._get_payload(
+            'summary', self._compute_dashboard_summary, version=version)
+
+    @api.model
+    @profiled('employee.performance.get_dashboard_details')
+    def get_dashboard_details(self, offset=0, limit=10, order='id', descending=True, version=None):
+        """One page of the KPI details table, sorted server-side over all KPI records.
+
+        The version token changes whenever a KPI record is created, written
+        or deleted, or the page parameters change.
+        """
+        KPI = self.env['employee.kpi']
+        if order not in self._DASHBOARD_DETAIL_ORDERS:
+            raise UserError(f"Cannot sort the dashboard details by {order!r}.")
+        [(total, last_write)] = KPI._read_group([], [], ['__count', 'write_date:max'])
+        token = f"{total}:{fields.Datetime.to_string(last_write) or ''}:{offset}:{limit}:{order}:{descending}"
+        if version == token:
+            return {'version': token, 'unchanged': True}
+
+        order_spec = f"{order} {'desc' if descending else 'asc'}"
+        if order != 'id':
+            order_spec += ', id desc'
+        records = KPI.search_fetch([], ['employee_id', 'level_id', 'overall_rating', 'level_rank', 'level_percentile', 'state'],
+                                   offset=offset, limit=limit, order=order_spec)
+        return {
+            'version': token,
+            'total': total,
+            'records': self._dashboard_detail_rows(records),
+        }
+
+    @api.model
+    def _dashboard_detail_rows(self, kpi_records):
+        rows = []
         for kpi in kpi_records:
-            kpi_data.append({
+            rows.append({
                 'employee_name': kpi.employee_id.name,
                 'responsible_role': kpi.employee_id.job_title or kpi.employee_id.job_id.name or '',
                 'level_name': kpi.level_id.name,
                 'overall_rating': kpi.overall_rating,
+                'level_rank': kpi.level_rank,
+                'level_percentile': kpi.level_percentile,
                 'status': 'Done' if kpi.state == 'done' else ('Draft' if kpi.state == 'draft' else 'Confirmed')
             })
-        
-        # Sample data structure
-        data = {
+        return rows
+
+    @api.model
+    def _compute_dashboard_levels(self):
+        """Average achievement per level, one grouped query over all lines"""
+        level_data = {}
+        level_groups = self.env['employee.performance.line']._read_group(
+            [('level_id', '!=', False)], ['level_id'], ['achieved_percentage:sum', '__count'])
+        for level, total_achieved, count in level_groups:
+            avg_achieved = total_achieved / count if count else 0
+            level_data[level.name.lower().replace(' ', '_')] = round(avg_achieved, 2)
+
+        return {
             'company_revenue': level_data.get('company_level', 0),
             'company_cs': level_data.get('company_level', 0),
             'c_level': level_data.get('c_level', 0),
             'division_tst': level_data.get('tst_division_level', 0),
             'division_pm': level_data.get('pm_division_level', 0),
-            'tst_overall_rating': tst_overall_rating,
-            'pm_overall_rating': pm_overall_rating,
+        }
+
+    @api.model
+    def _compute_dashboard_ratings(self):
+        """TST / PM overall ratings, one grouped query over KPI records per level"""
+        rating_totals = {'TST Individual': [0.0, 0], 'PM Individual': [0.0, 0]}
+        kpi_groups = self.env['employee.kpi']._read_group([], ['level_id'], ['overall_rating:sum', '__count'])
+        for level, total_rating, count in kpi_groups:
+            for pattern, totals in rating_totals.items():
+                if pattern.lower() in (level.name or '').lower():
+                    totals[0] += total_rating
+                    totals[1] += count
+
+        tst_total, tst_count = rating_totals['TST Individual']
+        pm_total, pm_count = rating_totals['PM Individual']
+        return {
+            'tst_overall_rating': round(tst_total / tst_count, 1) if tst_count else 0.0,
+            'pm_overall_rating': round(pm_total / pm_count, 1) if pm_count else 0.0,
+        }
+
+    @api.model
+    def _compute_dashboard_summary(self):
+        """Record counts per state in a single query"""
+        state_counts = dict(self._read_group([], ['state'], ['__count']))
+        total_count = sum(state_counts.values())
+        return {
             'summary': {
-                'total_kpis': len(self.search([])),
+                'total_kpis': total_count,
                 'avg_score': 0.0,
-                'active_kpis': len(self.search([('state', '!=', 'done')])),
-                'employees': len(env['hr.employee'].search([])),
-                'pending': len(self.search([('state', '=', 'draft')])),
+                'active_kpis': total_count - state_counts.get('done', 0),
+                'employees': self.env['hr.employee'].search_count([]),
+                'pending': state_counts.get('draft', 0),
             },
-            'performance_details': kpi_data
         }
-        
+
+    @api.model
+    def _compute_dashboard_data(self):
+        """Compute the whole dashboard payload from the live records"""
+        data = {}
+        data.update(self._compute_dashboard_levels())
+        data.update(self._compute_dashboard_ratings())
+        data.update(self._compute_dashboard_summary())
+        data['performance_details'] = self._dashboard_detail_rows(
+            self.env['employee.kpi'].search([], limit=10))
         return data
 
 
 class EmployeePerformanceLine(models.Model):
     _name = 'employee.performance.line'
     _description = 'Employee Performance Line'
+    _inherit = ['performance.dashboard.source', 'performance.rollup.line']
+    _rollup_model = 'employee.performance'
 
-    performance_id = fields.Many2one('employee.performance', string='Performance', required=True, ondelete='cascade')
-    objective_id = fields.Many2one('performance.objective', string='Objective', required=True)
+    performance_id = fields.Many2one('employee.performance', string='Performance', required=True, index=True, ondelete='cascade')
+    level_id = fields.Many2one(related='performance_id.level_id', store=True, index=True)
+    objective_id = fields.Many2one('performance.objective', string='Objective', required=True, index=True)
     target_percentage = fields.Float(string='Target Percentage')
     achieved_percentage = fields.Float(string='Achieved Percentage', compute='_compute_achieved_percentage', store=True)
+    # Within level and objective, refreshed by the nightly analytics job
+    achieved_zscore = fields.Float(string='Achievement Z-Score', readonly=True, copy=False)
     
     # Timeline
     timeline_from = fields.Date(string='Timeline From')
@@ -186,50 +298,94 @@ class EmployeePerformanceLine(models.Model):
     revenue_increased = fields.Float(string='Revenue Increased %', compute='_compute_revenue_increased', store=True)
 
     # UI visibility
-    show_job_completed = fields.Boolean(compute='_compute_visibility')
-    show_job_fixed = fields.Boolean(compute='_compute_visibility')
-    show_presence_schedule = fields.Boolean(compute='_compute_visibility')
-    show_service_reports = fields.Boolean(compute='_compute_visibility')
-    show_safety_incidents = fields.Boolean(compute='_compute_visibility')
-    show_quality_score = fields.Boolean(compute='_compute_visibility')
-    show_revenue = fields.Boolean(compute='_compute_visibility')
-
-    @api.depends('objective_id')
-    def _compute_visibility(self):
-        for rec in self:
-            objective = rec.objective_id
-            rec.show_job_completed = objective.show_job_completed
-            rec.show_job_fixed = objective.show_job_fixed
-            rec.show_presence_schedule = objective.show_presence_schedule
-            rec.show_service_reports = objective.show_service_reports
-            rec.show_safety_incidents = objective.show_safety_incidents
-            rec.show_quality_score = objective.show_quality_score
-            rec.show_revenue = objective.show_revenue
+    show_job_completed = fields.Boolean(related='objective_id.show_job_completed')
+    show_job_fixed = fields.Boolean(related='objective_id.show_job_fixed')
+    show_presence_schedule = fields.Boolean(related='objective_id.show_presence_schedule')
+    show_service_reports = fields.Boolean(related='objective_id.show_service_reports')
+    show_safety_incidents = fields.Boolean(related='objective_id.show_safety_incidents')
+    show_quality_score = fields.Boolean(related='objective_id.show_quality_score')
+    show_revenue = fields.Boolean(related='objective_id.show_revenue')
+
+    # Child lookups filter on objective and performance record, mostly achieved > 0
+    _objective_performance_idx = models.Index('(objective_id, performance_id) WHERE achieved_percentage > 0')
+    # Keyset cursor of the BI API's incremental pulls
+    _write_date_id_idx = models.Index('(write_date, id)')
 
     @api.depends('number_of_job_completed', 'number_of_wo', 'number_of_job_fixed_single_visit',
                  'number_of_job_attend', 'number_of_job_scheduled', 'number_of_job_submitted',
                  'number_of_job_opportunities', 'number_of_incidents', 'achieve_rating',
                  'previous_year_revenue', 'current_year_revenue', 'objective_id')
     def _compute_achieved_percentage(self):
-        for rec in self:
-            achieved = 0.0
-            
-            if rec.show_job_completed and rec.number_of_wo > 0:
-                achieved = (rec.number_of_job_completed / float(rec.number_of_wo)) * 100.0
-            elif rec.show_job_fixed and rec.number_of_wo > 0:
-                achieved = (rec.number_of_job_fixed_single_visit / float(rec.number_of_wo)) * 100.0
-            elif rec.show_presence_schedule and rec.number_of_job_scheduled > 0:
-                achieved = (rec.number_of_job_attend / float(rec.number_of_job_scheduled)) * 100.0
-            elif rec.show_service_reports and rec.number_of_job_completed > 0:
-                achieved = (rec.number_of_job_submitted / float(rec.number_of_job_completed)) * 100.0
-            elif rec.show_safety_incidents and rec.number_of_job_opportunities > 0:
-                achieved = ((rec.number_of_job_opportunities - rec.number_of_incidents) / float(rec.number_of_job_opportunities)) * 100.0
-            elif rec.show_quality_score and rec.achieve_rating is not None:
-                achieved = (rec.achieve_rating / 5.0) * 100.0
-            elif rec.show_revenue and rec.previous_year_revenue > 0:
-                achieved = rec.revenue_increased
-            
-            rec.achieved_percentage = round(achieved, 2)
+        # Resolve the formulas once per objective instead of once per line
+        for objective, lines in self.grouped('objective_id').items():
+            formulas = [formula[:2] for flag, formula in ACHIEVEMENT_FORMULAS.items() if objective[flag]]
+            for rec in lines:
+                achieved = 0.0
+                for guard, value in formulas:
+                    if guard(rec):
+                        achieved = value(rec)
+                        break
+                # Half away from zero, like ROUND() on numeric in the bulk recomputation
+                rec.achieved_percentage = float_round(achieved, precision_digits=2)
+
+    @api.model
+    def _recompute_achieved_percentage_bulk(self, objectives=None):
+        """Recompute the achieved percentage of all lines, or those of objectives, in one UPDATE.
+
+        The formula registry is compiled into a single CASE expression and
+        only rows whose value changes are written. Lines of supervisors are
+        left out: their achievement is rolled up from their subordinates,
+        not computed from their own counters. The linked KPI lines are
+        marked for recomputation and, with incremental rollup, both changes
+        are propagated to the supervisors' lines. Returns the number of
+        updated lines.
+        """
+        self.flush_model()
+        self.env['performance.objective'].flush_model()
+        self.env['hr.employee'].flush_model(['parent_id'])
+        cases = SQL(" ").join(
+            SQL("WHEN o.%s AND %s THEN %s", SQL.identifier(flag), SQL(sql_guard), SQL(sql_value))
+            for flag, (_guard, _value, sql_guard, sql_value) in ACHIEVEMENT_FORMULAS.items()
+        )
+        objective_filter = SQL("AND o.id IN %s", tuple(objectives.ids)) if objectives else SQL()
+        self.env.cr.execute(SQL(
+            """
+            UPDATE employee_performance_line l
+               SET achieved_percentage = c.value,
+                   write_date = (now() at time zone 'UTC'), write_uid = %s
+              FROM (SELECT l.id, p.employee_id, l.objective_id, l.achieved_percentage AS old_value,
+                           ROUND((CASE %s ELSE 0 END)::numeric, 2) AS value
+                      FROM employee_performance_line l
+                      JOIN employee_performance p ON p.id = l.performance_id
+                      JOIN performance_objective o ON o.id = l.objective_id
+                     WHERE NOT EXISTS (SELECT 1 FROM hr_employee s WHERE s.parent_id = p.employee_id) %s) c
+             WHERE c.id = l.id AND l.achieved_percentage IS DISTINCT FROM c.value
+         RETURNING l.id, c.employee_id, c.objective_id, c.old_value, c.value
+            """,
+            self.env.uid, cases, objective_filter,
+        ))
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return 0
+
+        # The bulk update bypasses the ORM hooks: replay what they would maintain
+        lines = self.browse([row[0] for row in rows])
+        rollup = self._rollup_enabled()
+        if rollup:
+            # Linked KPI lines still hold the previous achievement until recomputed
+            snapshot = [(dependents, dependents._rollup_contributions()) for dependents in lines._rollup_dependents()]
+        self.invalidate_model(['achieved_percentage', 'write_date', 'write_uid'])
+        lines.modified(['achieved_percentage'])
+        self.env['performance.dashboard.snapshot']._invalidate()
+        if rollup:
+            before = {line_id: (emp_id, objective_id, old or 0.0) for line_id, emp_id, objective_id, old, _new in rows}
+            after = {line_id: (emp_id, objective_id, float(new)) for line_id, emp_id, objective_id, _old, new in rows}
+            self.env['performance.aggregation']._propagate(self._rollup_model, before, after)
+            lines._rollup_propagate(snapshot)
+        return len(rows)
+
+    def _rollup_dependents(self):
+        return [self.env['employee.kpi.line'].search([('performance_line_id', 'in', self.ids)])]
 
     @api.depends('previous_year_revenue', 'current_year_revenue')
     def _compute_revenue_increased(self):
@@ -0,0 +1,227 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+
+class PerformanceReviewCycle(models.Model):
+    _name = 'performance.review.cycle'
+    _description = 'Review Cycle'
+    _order = 'date_from desc, id desc'
+
+    name = fields.Char(string='Name', required=True)
+    date_from = fields.Date(string='From', required=True)
+    date_to = fields.Date(string='To', required=True)
+    company_id = fields.Many2one('res.company', string='Company', required=True, default=lambda self: self.env.company)
+    state = fields.Selection([
+        ('open', 'Open'),
+        ('closed', 'Closed'),
+    ], string='Status', default='open', readonly=True)
+    date_closed = fields.Datetime(string='Closed On', readonly=True)
+    fact_count = fields.Integer(string='Frozen Facts', readonly=True)
+    fact_ids = fields.One2many('performance.cycle.fact', 'cycle_id', string='Facts')
+
+    def action_close(self):
+        """Freeze the achievements of the company's employees over the cycle's period into the fact table"""
+        for cycle in self:
+            if cycle.state != 'open':
+                raise UserError(f"Review cycle {cycle.name} is already closed.")
+            count = self.env['performance.cycle.fact']._freeze(cycle)
+            cycle.write({'state': 'closed', 'date_closed': fields.Datetime.now(), 'fact_count': count})
+
+    def action_view_facts(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': self.name,
+            'res_model': 'performance.cycle.fact',
+            'view_mode': 'pivot,graph,list',
+            'domain': [('cycle_id', '=', self.id)],
+        }
+
+    @api.model
+    def get_history(self, employee_id=None, subtree=False):
+        """Per closed cycle and objective averages, read from the fact table only.
+
+        With subtree, the employee's precomputed rollup over everyone under
+        them at closing time is returned instead of their own figures.
+        """
+        if subtree and not employee_id:
+            # Summing the rollups of several employees counts nested subtrees more than once
+            raise UserError("The subtree history is only available for a given employee.")
+        Fact = self.env['performance.cycle.fact']
+        domain = [('employee_id', '=', employee_id)] if employee_id else []
+        if subtree:
+            aggregates = ['subtree_total:sum', 'subtree_count:sum']
+        else:
+            aggregates = ['achieved_percentage:avg', 'kpi_achieved_percentage:avg', 'overall_rating:avg']
+        history = []
+        for cycle, objective, *values in Fact._read_group(domain, ['cycle_id', 'objective_id'], aggregates):
+            row = {'cycle': cycle.name, 'date_from': fields.Date.to_string(cycle.date_from), 'objective': objective.name}
+            if subtree:
+                total, count = values
+                row.update({'subtree_average': round(total / count, 2) if count else 0.0, 'subtree_count': count})
+            else:
+                row.update(dict(zip(('achieved_percentage', 'kpi_achieved_percentage', 'overall_rating'), values)))
+            history.append(row)
+        return history
+
+
+class PerformanceCycleFact(models.Model):
+    _name = 'performance.cycle.fact'
+    _description = 'Frozen Review Cycle Fact'
+    _order = 'cycle_id, employee_id, objective_id'
+    # Narrow, append-only table: no per-row audit columns
+    _log_access = False
+
+    cycle_id = fields.Many2one('performance.review.cycle', string='Cycle', required=True, ondelete='cascade')
+    employee_id = fields.Many2one('hr.employee', string='Employee', required=True, ondelete='cascade')
+    objective_id = fields.Many2one('performance.objective', string='Objective', required=True, ondelete='cascade')
+    # Supervisor chain at closing time, so later reorganizations don't rewrite history
+    parent_path = fields.Char(string='Hierarchy Path')
+    achieved_percentage = fields.Float(string='Achieved (%)', aggregator='avg')
+    kpi_achieved_percentage = fields.Float(string='KPI Achieved (%)', aggregator='avg')
+    weightage = fields.Float(string='Weightage (%)', aggregator='avg')
+    rating = fields.Float(string='Rating', aggregator='avg')
+    overall_rating = fields.Float(string='Overall Rating', aggregator='avg')
+    # Positive achievements of everyone under the employee, for the objective
+    subtree_total = fields.Float(string='Subtree Total')
+    subtree_count = fields.Integer(string='Subtree Contributors')
+    subtree_average = fields.Float(string='Subtree Achieved (%)', aggregator='avg')
+
+    _cycle_employee_objective_uniq = models.UniqueIndex('(cycle_id, employee_id, objective_id)')
+    _employee_cycle_idx = models.Index('(employee_id, cycle_id)')
+    _parent_path_idx = models.Index('(cycle_id, parent_path varchar_pattern_ops)')
+
+    def write(self, vals):
+        raise UserError("Review cycle facts are frozen and cannot be modified.")
+
+    def unlink(self):
+        raise UserError("Review cycle facts are frozen and cannot be deleted.")
+
+    @api.model
+    def _freeze(self, cycle):
+        """Insert one fact per employee and objective of the cycle's company, then the subtree rollups.
+
+        Only lines belonging to the cycle's period are frozen (see
+        _in_cycle), taken from each employee's latest performance and KPI
+        records having such lines; everything is done with set-based SQL.
+        Returns the number of facts.
+        """
+        self.env.flush_all()
+        cr = self.env.cr
+        cr.execute(SQL(
+            """
+            WITH perf_in_cycle AS (
+                SELECT p.id, p.employee_id, l.objective_id, l.achieved_percentage
+                  FROM employee_performance p
+                  JOIN employee_performance_line l ON l.performance_id = p.id
+                 WHERE %(perf_in_cycle)s
+            ), kpi_in_cycle AS (
+                SELECT k.id, k.employee_id, k.overall_rating, l.objective_id, l.achieved_percentage, l.weightage, l.rating
+                  FROM employee_kpi k
+                  JOIN employee_kpi_line l ON l.kpi_id = k.id
+             LEFT JOIN employee_performance_line pl ON pl.id = l.performance_line_id
+                 WHERE %(kpi_in_cycle)s
+            ), perf AS (
+                SELECT DISTINCT ON (employee_id) id
+                  FROM perf_in_cycle
+              ORDER BY employee_id, id DESC
+            ), kpi AS (
+                SELECT DISTINCT ON (employee_id) id
+                  FROM kpi_in_cycle
+              ORDER BY employee_id, id DESC
+            ), perf_lines AS (
+                SELECT l.employee_id, l.objective_id, avg(l.achieved_percentage) AS achieved
+                  FROM perf_in_cycle l
+                  JOIN perf p ON p.id = l.id
+              GROUP BY l.employee_id, l.objective_id
+            ), kpi_lines AS (
+                SELECT l.employee_id, l.objective_id,
+                       avg(l.achieved_percentage) AS achieved,
+                       sum(l.weightage) AS weightage,
+                       avg(l.rating) AS rating,
+                       max(l.overall_rating) AS overall_rating
+                  FROM kpi_in_cycle l
+                  JOIN kpi k ON k.id = l.id
+              GROUP BY l.employee_id, l.objective_id
+            )
+            INSERT INTO performance_cycle_fact (
+                cycle_id, employee_id, objective_id, parent_path, achieved_percentage,
+                kpi_achieved_percentage, weightage, rating, overall_rating, subtree_total, subtree_count
+            )
+            SELECT %(cycle)s, e.id, COALESCE(pl.objective_id, kl.objective_id), e.parent_path,
+                   pl.achieved, kl.achieved, kl.weightage, kl.rating, kl.overall_rating, 0, 0
+              FROM perf_lines pl
+              FULL JOIN kpi_lines kl ON kl.employee_id = pl.employee_id AND kl.objective_id = pl.objective_id
+              JOIN hr_employee e ON e.id = COALESCE(pl.employee_id, kl.employee_id)
+             WHERE e.company_id = %(company)s
+            """,
+            cycle=cycle.id, company=cycle.company_id.id,
+            perf_in_cycle=self._in_cycle(cycle, SQL("l.timeline_from"), SQL("l.timeline_to"), SQL("p.create_date")),
+            # KPI lines follow the period of their performance line
+            kpi_in_cycle=self._in_cycle(cycle, SQL("pl.timeline_from"), SQL("pl.timeline_to"), SQL("k.create_date")),
+        ))
+        count = cr.rowcount
+        self._rollup_subtrees(cycle)
+        return count
+
+    @api.model
+    def _in_cycle(self, cycle, timeline_from, timeline_to, create_date):
+        """SQL condition of a line belonging to the cycle.
+
+        Its timeline overlaps the cycle's period or, without a timeline, its
+        record was created during it.
+        """
+        return SQL(
+            """
+            CASE WHEN %(timeline_from)s IS NULL AND %(timeline_to)s IS NULL
+                 THEN %(create_date)s::date BETWEEN %(date_from)s AND %(date_to)s
+                 ELSE COALESCE(%(timeline_from)s, %(date_from)s) <= %(date_to)s
+                  AND COALESCE(%(timeline_to)s, %(date_to)s) >= %(date_from)s
+            END
+            """,
+            timeline_from=timeline_from, timeline_to=timeline_to, create_date=create_date,
+            date_from=cycle.date_from, date_to=cycle.date_to,
+        )
+
+    @api.model
+    def _rollup_subtrees(self, cycle):
+        """Precompute every fact's subtree total and count from the frozen rows.
+
+        Each positive achievement is added to all ancestors found in its
+        frozen parent_path, so one pass covers the whole org.
+        """
+        cr = self.env.cr
+        cr.execute(SQL(
+            """
+            SELECT employee_id, objective_id, parent_path, achieved_percentage
+              FROM performance_cycle_fact
+             WHERE cycle_id = %s AND achieved_percentage > 0
+            """,
+            cycle.id,
+        ))
+        totals = defaultdict(lambda: [0.0, 0])
+        for employee_id, objective_id, parent_path, achieved in cr.fetchall():
+            for ancestor in (parent_path or '').split('/')[:-2]:
+                total = totals[(int(ancestor), objective_id)]
+                total[0] += achieved
+                total[1] += 1
+        if not totals:
+            return
+
+        keys = list(totals)
+        cr.execute(SQL(
+            """
+            UPDATE performance_cycle_fact f
+               SET subtree_total = v.total,
+                   subtree_count = v.count,
+                   subtree_average = round((v.total / v.count)::numeric, 2)
+              FROM unnest(%s::int[], %s::int[], %s::float8[], %s::int[]) AS v(employee_id, objective_id, total, count)
+             WHERE f.cycle_id = %s AND f.employee_id = v.employee_id AND f.objective_id = v.objective_id
+            """,
+            [key[0] for key in keys], [key[1] for key in keys],
+            [totals[key][0] for key in keys], [totals[key][1] for key in keys],
+            cycle.id,
+        ))
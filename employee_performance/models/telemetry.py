@@ -0,0 +1,124 @@
+import contextvars
+import functools
+import threading
+import time
+
+from odoo import models, fields, api, tools
+from odoo.tools import SQL, str2bool
+
+# Records touched by the entry point currently running, as a one-item list
+_touched = contextvars.ContextVar('employee_performance_touched', default=None)
+
+
+def add_touched_records(count):
+    """Report count records handled by the running profiled entry point"""
+    touched = _touched.get()
+    if touched is not None:
+        touched[0] += count
+
+
+def profiled(entry_point):
+    """Record wall time, SQL count/time and records touched of successful calls of a model method.
+
+    Costs one cached config parameter lookup when telemetry is disabled.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.env['performance.telemetry.sample']._is_enabled():
+                return method(self, *args, **kwargs)
+
+            thread = threading.current_thread()
+            cr = self.env.cr
+            queries, query_time = cr.sql_log_count, getattr(thread, 'query_time', 0.0)
+            token = _touched.set([len(self)])
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                wall_time = time.perf_counter() - start
+                touched = _touched.get()[0]
+                _touched.reset(token)
+                add_touched_records(touched)
+            # Only successful calls are sampled: a failed one may have aborted
+            # the transaction, and writing the sample would hide its error
+            self.env['performance.telemetry.sample']._record({
+                'entry_point': entry_point,
+                'wall_ms': wall_time * 1000,
+                'sql_count': cr.sql_log_count - queries,
+                'sql_ms': (getattr(thread, 'query_time', 0.0) - query_time) * 1000,
+                'record_count': touched,
+            })
+            return result
+        return wrapper
+    return decorator
+
+
+class PerformanceTelemetrySample(models.Model):
+    _name = 'performance.telemetry.sample'
+    _description = 'Performance Telemetry Sample'
+    _order = 'id desc'
+
+    entry_point = fields.Char(string='Entry Point', required=True, index=True)
+    wall_ms = fields.Float(string='Wall Time (ms)')
+    sql_count = fields.Integer(string='SQL Queries')
+    sql_ms = fields.Float(string='SQL Time (ms)')
+    record_count = fields.Integer(string='Records')
+    user_id = fields.Many2one('res.users', string='User', default=lambda self: self.env.uid)
+
+    @api.model
+    def _is_enabled(self):
+        param = self.env['ir.config_parameter'].sudo().get_param('employee_performance.telemetry')
+        return str2bool(param or '0')
+
+    @api.model
+    def _record(self, vals):
+        self.sudo().create(vals)
+
+    @api.autovacuum
+    def _gc_samples(self):
+        """Keep only the most recent samples, turning the table into a ring buffer"""
+        size = int(self.env['ir.config_parameter'].sudo().get_param('employee_performance.telemetry_buffer', 10000))
+        self.env.cr.execute(SQL(
+            "DELETE FROM %s WHERE id <= (SELECT id FROM %s ORDER BY id DESC OFFSET %s LIMIT 1)",
+            SQL.identifier(self._table), SQL.identifier(self._table), size,
+        ))
+
+
+class PerformanceTelemetryReport(models.Model):
+    _name = 'performance.telemetry.report'
+    _description = 'Performance Telemetry Percentiles'
+    _auto = False
+    _order = 'wall_p95_ms desc'
+
+    entry_point = fields.Char(string='Entry Point', readonly=True)
+    calls = fields.Integer(string='Calls', readonly=True)
+    wall_p50_ms = fields.Float(string='Wall p50 (ms)', readonly=True)
+    wall_p95_ms = fields.Float(string='Wall p95 (ms)', readonly=True)
+    sql_count_p50 = fields.Float(string='Queries p50', readonly=True)
+    sql_count_p95 = fields.Float(string='Queries p95', readonly=True)
+    sql_p50_ms = fields.Float(string='SQL p50 (ms)', readonly=True)
+    sql_p95_ms = fields.Float(string='SQL p95 (ms)', readonly=True)
+    record_count_p95 = fields.Float(string='Records p95', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(SQL(
+            """
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT row_number() OVER (ORDER BY entry_point) AS id,
+                       entry_point,
+                       count(*) AS calls,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY wall_ms) AS wall_p50_ms,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY wall_ms) AS wall_p95_ms,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY sql_count) AS sql_count_p50,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY sql_count) AS sql_count_p95,
+                       percentile_cont(0.5) WITHIN GROUP (ORDER BY sql_ms) AS sql_p50_ms,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY sql_ms) AS sql_p95_ms,
+                       percentile_cont(0.95) WITHIN GROUP (ORDER BY record_count) AS record_count_p95
+                  FROM performance_telemetry_sample
+              GROUP BY entry_point
+            )
+            """,
+            SQL.identifier(self._table),
+        ))
@@ -13,7 +13,18 @@ class EmployeePerformanceDashboard extends Component {
             loading: true,
             data: null,
             error: null,
+            details: {
+                records: [],
+                total: 0,
+                offset: 0,
+                limit: 10,
+                order: "id",
+                descending: true,
+                loading: true,
+            },
         });
+        // Last version token received per card, sent back to skip unchanged payloads
+        this.versions = {};
 
         onMounted(() => {
             this.loadData();
@@ -21,19 +32,92 @@ class EmployeePerformanceDashboard extends Component {
     }
 
     async loadData() {
+        this.state.loading = true;
+        this.state.data = this.state.data || {};
+        // Cards are fetched in parallel and rendered as soon as each one arrives
+        await Promise.all([
+            this.loadCard("levels", "get_dashboard_levels"),
+            this.loadCard("ratings", "get_dashboard_ratings"),
+            this.loadCard("summary", "get_dashboard_summary"),
+            this.loadDetails(),
+        ]);
+        this.state.loading = false;
+    }
+
+    async loadCard(card, method) {
+        try {
+            const result = await this.orm.call("employee.performance", method, [], {
+                version: this.versions[card],
+            });
+            this.versions[card] = result.snapshot.version;
+            if (!result.unchanged) {
+                Object.assign(this.state.data, result);
+            }
+            this.state.data[card + "_loaded"] = true;
+        } catch (error) {
+            console.error(`Error loading dashboard ${card}:`, error);
+            this.state.error = error;
+            const mock = this.getMockData();
+            for (const key in mock) {
+                if (!(key in this.state.data)) {
+                    this.state.data[key] = mock[key];
+                }
+            }
+            this.state.data[card + "_loaded"] = true;
+        }
+    }
+
+    async loadDetails() {
+        const details = this.state.details;
+        details.loading = true;
         try {
-            this.state.loading = true;
-            const data = await this.orm.call("employee.performance", "get_dashboard_data", []);
-            this.state.data = data;
+            const result = await this.orm.call("employee.performance", "get_dashboard_details", [], {
+                offset: details.offset,
+                limit: details.limit,
+                order: details.order,
+                descending: details.descending,
+                version: this.versions.details,
+            });
+            this.versions.details = result.version;
+            if (!result.unchanged) {
+                details.records = result.records;
+                details.total = result.total;
+            }
         } catch (error) {
-            console.error("Error loading dashboard data:", error);
+            console.error("Error loading dashboard details:", error);
             this.state.error = error;
-            this.state.data = this.getMockData();
+            details.records = this.getMockData().performance_details;
+            details.total = details.records.length;
         } finally {
-            this.state.loading = false;
+            details.loading = false;
         }
     }
 
+    onDetailsPage(step) {
+        const details = this.state.details;
+        const offset = details.offset + step * details.limit;
+        if (offset >= 0 && offset < details.total) {
+            details.offset = offset;
+            this.loadDetails();
+        }
+    }
+
+    onDetailsSort(order) {
+        const details = this.state.details;
+        details.descending = details.order === order ? !details.descending : false;
+        details.order = order;
+        details.offset = 0;
+        this.loadDetails();
+    }
+
+    getSortIcon(order) {
+        const details = this.state.details;
+        if (details.order !== order) {
+            return "";
+        }
+        return details.descending ? " ▼" : " ▲";
+    }
+
     getMockData() {
         return {
             company_revenue: 18,
@@ -132,18 +216,8 @@ class EmployeePerformanceDashboard extends Component {
 // Dashboard Template
 EmployeePerformanceDashboard.template = xml`
 <div class="o_employee_performance_dashboard p-3">
-    <!-- Loading State -->
-    <t t-if="state.loading">
-        <div class="text-center p-5">
-            <div class="spinner-border" role="status">
-                <span class="visually-hidden">Loading...</span>
-            </div>
-            <div class="mt-2">Loading dashboard data...</div>
-        </div>
-    </t>
-
     <!-- Error State -->
-    <t t-elif="state.error">
+    <t t-if="state.error">
         <div class="alert alert-danger">
             <h4>Error Loading Dashboard</h4>
             <p>Failed to load dashboard data. Showing sample data instead.</p>
@@ -151,11 +225,17 @@ EmployeePerformanceDashboard.template = xml`
     </t>
 
     <!-- Main Dashboard Content -->
-    <div t-if="!state.loading and state.data">
+    <div t-if="state.data">
         <div class="d-flex justify-content-between align-items-center mb-3">
             <div>
                 <h1 class="mb-0">Performance Dashboard</h1>
                 <div class="text-muted small">Monitor Performance Across All Levels</div>
+                <div class="text-muted small" t-if="state.data.snapshot">
+                    Data as of <t t-esc="state.data.snapshot.generated_at"/> UTC
+                </div>
+                <div class="text-muted small" t-if="state.loading">
+                    <span class="spinner-border spinner-border-sm me-1" role="status"/>Loading dashboard data...
+                </div>
             </div>
             <div>
                 <button type="button" class="btn btn-primary me-2" t-on-click="onAddKPI">Add KPI</button>
@@ -168,21 +248,24 @@ EmployeePerformanceDashboard.template = xml`
             <div class="col-md-6">
                 <div class="card p-3">
                     <h6 class="text-muted">Company Level</h6>
-                    <div class="d-flex justify-content-between">
-                        <span>Revenue Increase</span>
-                        <span class="fw-bold" t-esc="state.data.company_revenue + '%'"/>
-                    </div>
-                    <div class="progress mb-2" style="height:6px;">
-                        <div class="progress-bar" role="progressbar" t-att-style="'width: ' + state.data.company_revenue + '%'"/>
-                    </div>
+                    <t t-if="state.data.levels_loaded">
+                        <div class="d-flex justify-content-between">
+                            <span>Revenue Increase</span>
+                            <span class="fw-bold" t-esc="state.data.company_revenue + '%'"/>
+                        </div>
+                        <div class="progress mb-2" style="height:6px;">
+                            <div class="progress-bar" role="progressbar" t-att-style="'width: ' + state.data.company_revenue + '%'"/>
+                        </div>
 
-                    <div class="d-flex justify-content-between">
-                        <span>Customer Satisfaction</span>
-                        <span class="fw-bold" t-esc="state.data.company_cs + '%'"/>
-                    </div>
-                    <div class="progress" style="height:6px;">
-                        <div class="progress-bar bg-success" role="progressbar" t-att-style="'width: ' + state.data.company_cs + '%'"/>
-                    </div>
+                        <div class="d-flex justify-content-between">
+                            <span>Customer Satisfaction</span>
+                            <span class="fw-bold" t-esc="state.data.company_cs + '%'"/>
+                        </div>
+                        <div class="progress" style="height:6px;">
+                            <div class="progress-bar bg-success" role="progressbar" t-att-style="'width: ' + state.data.company_cs + '%'"/>
+                        </div>
+                    </t>
+                    <div t-else="" class="text-center p-3"><span class="spinner-border spinner-border-sm" role="status"/></div>
                 </div>
             </div>
 
@@ -190,17 +273,20 @@ EmployeePerformanceDashboard.template = xml`
             <div class="col-md-3">
                 <div class="card p-3 text-center">
                     <h6 class="text-muted">C Level</h6>
-                    <div class="my-2">
-                        <svg width="90" height="90">
-                            <circle cx="45" cy="45" r="40" stroke="#eee" stroke-width="8" fill="none"/>
-                            <circle cx="45" cy="45" r="40" stroke="#7c4dff" stroke-width="8" fill="none" 
-                                    stroke-linecap="round"
-                                    t-att-stroke-dasharray="getCircleStroke(state.data.c_level).strokeDasharray"
-                                    t-att-stroke-dashoffset="getCircleStroke(state.data.c_level).strokeDashoffset"/>
-                        </svg>
-                        <div class="mt-2 fw-bold" t-esc="state.data.c_level + '%'"/>
-                        <div class="small text-muted">Job Completion</div>
-                    </div>
+                    <t t-if="state.data.levels_loaded">
+                        <div class="my-2">
+                            <svg width="90" height="90">
+                                <circle cx="45" cy="45" r="40" stroke="#eee" stroke-width="8" fill="none"/>
+                                <circle cx="45" cy="45" r="40" stroke="#7c4dff" stroke-width="8" fill="none" 
+                                        stroke-linecap="round"
+                                        t-att-stroke-dasharray="getCircleStroke(state.data.c_level).strokeDasharray"
+                                        t-att-stroke-dashoffset="getCircleStroke(state.data.c_level).strokeDashoffset"/>
+                            </svg>
+                            <div class="mt-2 fw-bold" t-esc="state.data.c_level + '%'"/>
+                            <div class="small text-muted">Job Completion</div>
+                        </div>
+                    </t>
+                    <div t-else="" class="text-center p-3"><span class="spinner-border spinner-border-sm" role="status"/></div>
                 </div>
             </div>
 
@@ -208,22 +294,25 @@ EmployeePerformanceDashboard.template = xml`
             <div class="col-md-3">
                 <div class="card p-3">
                     <h6 class="text-muted">Performance Summary</h6>
-                    <div class="d-flex justify-content-between">
-                        <div>
-                            <div class="fw-bold fs-4" t-esc="state.data.summary.total_kpis + '%'"/>
-                            <div class="small text-muted">Total KPIs Achieved</div>
-                        </div>
-                        <div>
-                            <div class="fw-bold fs-4" t-esc="state.data.summary.avg_score + '/5'"/>
-                            <div class="small text-muted">Average Score</div>
+                    <t t-if="state.data.summary_loaded">
+                        <div class="d-flex justify-content-between">
+                            <div>
+                                <div class="fw-bold fs-4" t-esc="state.data.summary.total_kpis + '%'"/>
+                                <div class="small text-muted">Total KPIs Achieved</div>
+                            </div>
+                            <div>
+                                <div class="fw-bold fs-4" t-esc="state.data.summary.avg_score + '/5'"/>
+                                <div class="small text-muted">Average Score</div>
+                            </div>
                         </div>
-                    </div>
 
-                    <div class="mt-3 small">
-                        <div>Active KPIs: <span class="fw-bold" t-esc="state.data.summary.active_kpis"/></div>
-                        <div>Employees Evaluated: <span class="fw-bold" t-esc="state.data.summary.employees"/></div>
-                        <div>Pending Reviews: <span class="fw-bold text-warning" t-esc="state.data.summary.pending"/></div>
-                    </div>
+                        <div class="mt-3 small">
+                            <div>Active KPIs: <span class="fw-bold" t-esc="state.data.summary.active_kpis"/></div>
+                            <div>Employees Evaluated: <span class="fw-bold" t-esc="state.data.summary.employees"/></div>
+                            <div>Pending Reviews: <span class="fw-bold text-warning" t-esc="state.data.summary.pending"/></div>
+                        </div>
+                    </t>
+                    <div t-else="" class="text-center p-3"><span class="spinner-border spinner-border-sm" role="status"/></div>
                 </div>
             </div>
         </div>
@@ -234,20 +323,23 @@ EmployeePerformanceDashboard.template = xml`
             <div class="col-md-6">
                 <div class="card p-3">
                     <h6 class="text-muted">Division Level</h6>
-                    <div class="d-flex gap-3">
-                        <div class="text-center">
-                            <div class="rounded-circle border border-primary d-flex align-items-center justify-content-center" style="width:90px;height:90px;">
-                                <div class="fw-bold fs-5" t-esc="state.data.division_tst + '%'"/>
+                    <t t-if="state.data.levels_loaded">
+                        <div class="d-flex gap-3">
+                            <div class="text-center">
+                                <div class="rounded-circle border border-primary d-flex align-items-center justify-content-center" style="width:90px;height:90px;">
+                                    <div class="fw-bold fs-5" t-esc="state.data.division_tst + '%'"/>
+                                </div>
+                                <div class="small text-muted mt-1">TST Performance</div>
                             </div>
-                            <div class="small text-muted mt-1">TST Performance</div>
-                        </div>
-                        <div class="text-center">
-                            <div class="rounded-circle border border-info d-flex align-items-center justify-content-center" style="width:90px;height:90px;">
-                                <div class="fw-bold fs-5" t-esc="state.data.division_pm + '%'"/>
+                            <div class="text-center">
+                                <div class="rounded-circle border border-info d-flex align-items-center justify-content-center" style="width:90px;height:90px;">
+                                    <div class="fw-bold fs-5" t-esc="state.data.division_pm + '%'"/>
+                                </div>
+                                <div class="small text-muted mt-1">PM Performance</div>
                             </div>
-                            <div class="small text-muted mt-1">PM Performance</div>
                         </div>
-                    </div>
+                    </t>
+                    <div t-else="" class="text-center p-3"><span class="spinner-border spinner-border-sm" role="status"/></div>
                 </div>
             </div>
 
@@ -255,60 +347,78 @@ EmployeePerformanceDashboard.template = xml`
             <div class="col-md-6">
                 <div class="card p-3">
                     <h6 class="text-muted">Individual Level</h6>
-                    <div class="row">
-                        <!-- TST Overall Rating -->
-                        <div class="col-6 text-center">
-                            <div class="mb-3">
-                                <svg width="70" height="70">
-                                    <circle cx="35" cy="35" r="30" stroke="#eee" stroke-width="6" fill="none"/>
-                                    <circle cx="35" cy="35" r="30" stroke="#007bff" stroke-width="6" fill="none" 
-                                            stroke-linecap="round"
-                                            t-att-stroke-dasharray="getRatingCircleStroke(state.data.tst_overall_rating).strokeDasharray"
-                                            t-att-stroke-dashoffset="getRatingCircleStroke(state.data.tst_overall_rating).strokeDashoffset"/>
-                                </svg>
+                    <t t-if="state.data.ratings_loaded">
+                        <div class="row">
+                            <!-- TST Overall Rating -->
+                            <div class="col-6 text-center">
+                                <div class="mb-3">
+                                    <svg width="70" height="70">
+                                        <circle cx="35" cy="35" r="30" stroke="#eee" stroke-width="6" fill="none"/>
+                                        <circle cx="35" cy="35" r="30" stroke="#007bff" stroke-width="6" fill="none" 
+                                                stroke-linecap="round"
+                                                t-att-stroke-dasharray="getRatingCircleStroke(state.data.tst_overall_rating).strokeDasharray"
+                                                t-att-stroke-dashoffset="getRatingCircleStroke(state.data.tst_overall_rating).strokeDashoffset"/>
+                                    </svg>
+                                </div>
+                                <div class="fw-bold fs-5" t-esc="state.data.tst_overall_rating"/>
+                                <div class="small text-muted">TST Overall Rating</div>
                             </div>
-                            <div class="fw-bold fs-5" t-esc="state.data.tst_overall_rating"/>
-                            <div class="small text-muted">TST Overall Rating</div>
-                        </div>
                         
-                        <!-- PM Overall Rating -->
-                        <div class="col-6 text-center">
-                            <div class="mb-3">
-                                <svg width="70" height="70">
-                                    <circle cx="35" cy="35" r="30" stroke="#eee" stroke-width="6" fill="none"/>
-                                    <circle cx="35" cy="35" r="30" stroke="#28a745" stroke-width="6" fill="none" 
-                                            stroke-linecap="round"
-                                            t-att-stroke-dasharray="getRatingCircleStroke(state.data.pm_overall_rating).strokeDasharray"
-                                            t-att-stroke-dashoffset="getRatingCircleStroke(state.data.pm_overall_rating).strokeDashoffset"/>
-                                </svg>
+                            <!-- PM Overall Rating -->
+                            <div class="col-6 text-center">
+                                <div class="mb-3">
+                                    <svg width="70" height="70">
+                                        <circle cx="35" cy="35" r="30" stroke="#eee" stroke-width="6" fill="none"/>
+                                        <circle cx="35" cy="35" r="30" stroke="#28a745" stroke-width="6" fill="none" 
+                                                stroke-linecap="round"
+                                                t-att-stroke-dasharray="getRatingCircleStroke(state.data.pm_overall_rating).strokeDasharray"
+                                                t-att-stroke-dashoffset="getRatingCircleStroke(state.data.pm_overall_rating).strokeDashoffset"/>
+                                    </svg>
+                                </div>
+                                <div class="fw-bold fs-5" t-esc="state.data.pm_overall_rating"/>
+                                <div class="small text-muted">PM Overall Rating</div>
                             </div>
-                            <div class="fw-bold fs-5" t-esc="state.data.pm_overall_rating"/>
-                            <div class="small text-muted">PM Overall Rating</div>
                         </div>
-                    </div>
+                    </t>
+                    <div t-else="" class="text-center p-3"><span class="spinner-border spinner-border-sm" role="status"/></div>
                 </div>
             </div>
         </div>
 
         <!-- Performance Details -->
         <div class="card p-3 mt-3">
-            <h6 class="text-muted">Performance Details</h6>
-            <table class="table table-sm mt-2">
+            <div class="d-flex justify-content-between align-items-center">
+                <h6 class="text-muted mb-0">Performance Details</h6>
+                <div class="small text-muted" t-if="state.details.total">
+                    <t t-esc="state.details.offset + 1"/>-<t t-esc="Math.min(state.details.offset + state.details.limit, state.details.total)"/>
+                    / <t t-esc="state.details.total"/>
+                    <button type="button" class="btn btn-sm btn-link" t-att-disabled="state.details.offset === 0" t-on-click="() => this.onDetailsPage(-1)">&lt;</button>
+                    <button type="button" class="btn btn-sm btn-link" t-att-disabled="state.details.offset + state.details.limit >= state.details.total" t-on-click="() => this.onDetailsPage(1)">&gt;</button>
+                </div>
+            </div>
+            <table class="table table-sm mt-2" t-att-class="{'opacity-50': state.details.loading}">
                 <thead class="table-light">
                     <tr>
-                        <th>Employee Name</th>
+                        <th class="cursor-pointer" t-on-click="() => this.onDetailsSort('employee_id')">Employee Name<t t-esc="getSortIcon('employee_id')"/></th>
                         <th>Responsible Role</th>
-                        <th>Level Name</th>
-                        <th>Overall Rating</th>
-                        <th>Status</th>
+                        <th class="cursor-pointer" t-on-click="() => this.onDetailsSort('level_id')">Level Name<t t-esc="getSortIcon('level_id')"/></th>
+                        <th class="cursor-pointer" t-on-click="() => this.onDetailsSort('overall_rating')">Overall Rating<t t-esc="getSortIcon('overall_rating')"/></th>
+                        <th class="cursor-pointer" t-on-click="() => this.onDetailsSort('level_rank')">Rank in Level<t t-esc="getSortIcon('level_rank')"/></th>
+                        <th class="cursor-pointer" t-on-click="() => this.onDetailsSort('state')">Status<t t-esc="getSortIcon('state')"/></th>
                     </tr>
                 </thead>
                 <tbody>
-                    <tr t-foreach="state.data.performance_details" t-as="detail" t-key="detail_index">
+                    <tr t-foreach="state.details.records" t-as="detail" t-key="detail_index">
                         <td t-esc="detail.employee_name"/>
                         <td t-esc="detail.responsible_role"/>
                         <td t-esc="detail.level_name"/>
                         <td t-esc="detail.overall_rating"/>
+                        <td>
+                            <t t-if="detail.level_rank">
+                                <t t-esc="detail.level_rank"/>
+                                <span class="text-muted small"> (P<t t-esc="Math.round(detail.level_percentile)"/>)</span>
+                            </t>
+                        </td>
                         <td>
                             <span t-att-class="'badge ' + getStatusBadgeClass(detail.status)" t-esc="detail.status"/>
                         </td>
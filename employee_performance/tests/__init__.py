@@ -0,0 +1,4 @@
+from . import test_achievement_formulas
+from . import test_aggregation
+from . import test_dashboard
+from . import test_benchmark
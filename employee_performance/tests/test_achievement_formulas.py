@@ -0,0 +1,56 @@
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import SQL, float_round
+
+from odoo.addons.employee_performance.models.performance import ACHIEVEMENT_FORMULAS
+
+# Counter values covering the guards on both sides, ties for rounding
+# (1 / 32 = 3.125%), zeros and negative revenue growth
+SAMPLES = [
+    {},
+    {'number_of_wo': 32, 'number_of_job_completed': 1, 'number_of_job_fixed_single_visit': 3},
+    {'number_of_wo': 7, 'number_of_job_completed': 5, 'number_of_job_fixed_single_visit': 7},
+    {'number_of_job_scheduled': 8, 'number_of_job_attend': 3},
+    {'number_of_job_completed': 3, 'number_of_job_submitted': 2},
+    {'number_of_job_opportunities': 16, 'number_of_incidents': 17},
+    {'number_of_job_opportunities': 40, 'number_of_incidents': 1},
+    {'achieve_rating': 3.7},
+    {'previous_year_revenue': 1000000.0, 'current_year_revenue': 850000.0},
+    {'previous_year_revenue': 3.0, 'current_year_revenue': 4.0},
+    {'previous_year_revenue': 1000.0},
+]
+
+
+@tagged('post_install', '-at_install')
+class TestAchievementFormulas(TransactionCase):
+    """The Python and SQL halves of every formula must agree, rounding included"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        objective = cls.env['performance.objective'].create({'name': 'Formula Parity'})
+        employee = cls.env['hr.employee'].create({'name': 'Formula Employee'})
+        performance = cls.env['employee.performance'].create({
+            'employee_id': employee.id,
+            'level_id': cls.env['performance.level'].create({'name': 'Formula Level'}).id,
+        })
+        cls.lines = cls.env['employee.performance.line'].create([
+            dict(vals, performance_id=performance.id, objective_id=objective.id) for vals in SAMPLES
+        ])
+        cls.env.flush_all()
+
+    def test_python_sql_parity(self):
+        for flag, (guard, value, sql_guard, sql_value) in ACHIEVEMENT_FORMULAS.items():
+            self.env.cr.execute(SQL(
+                """
+                SELECT l.id, ROUND((CASE WHEN %s THEN %s ELSE 0 END)::numeric, 2)
+                  FROM employee_performance_line l
+                 WHERE l.id IN %s
+                """,
+                SQL(sql_guard), SQL(sql_value), tuple(self.lines.ids),
+            ))
+            sql_values = {line_id: float(achieved) for line_id, achieved in self.env.cr.fetchall()}
+            for line in self.lines:
+                with self.subTest(formula=flag, line=line.id):
+                    expected = float_round(value(line) if guard(line) else 0.0, precision_digits=2)
+                    self.assertEqual(sql_values[line.id], expected)
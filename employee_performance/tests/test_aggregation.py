@@ -0,0 +1,59 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestIncrementalRollup(TransactionCase):
+    """Incremental rollup must end up where a full aggregation of the subtree does"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.env['ir.config_parameter'].sudo().set_param('employee_performance.incremental_rollup', 'True')
+        Employee = cls.env['hr.employee']
+        cls.top = Employee.create({'name': 'Top'})
+        cls.manager_1, cls.manager_2 = Employee.create([
+            {'name': 'Manager 1', 'parent_id': cls.top.id},
+            {'name': 'Manager 2', 'parent_id': cls.top.id},
+        ])
+        cls.employee_a, cls.employee_b, cls.employee_c = Employee.create([
+            {'name': 'Employee A', 'parent_id': cls.manager_1.id},
+            {'name': 'Employee B', 'parent_id': cls.manager_1.id},
+            {'name': 'Employee C', 'parent_id': cls.manager_2.id},
+        ])
+        objective = cls.env['performance.objective'].create({'name': 'Quality Score', 'show_quality_score': True})
+        level = cls.env['performance.level'].create({
+            'name': 'Rollup Level',
+            'objective_line_ids': [(0, 0, {'objective_id': objective.id, 'target_percentage': 100.0})],
+        })
+        employees = cls.top | cls.manager_1 | cls.manager_2 | cls.employee_a | cls.employee_b | cls.employee_c
+        cls.performances, _kpis = level._open_review_cycle(employees, kpi=False)
+
+    def _rate(self, employee, rating, propagate=True):
+        lines = self.performances.filtered(lambda p: p.employee_id == employee).performance_line_ids
+        if not propagate:
+            lines = lines.with_context(skip_rollup_propagation=True)
+        lines.write({'achieve_rating': rating})
+
+    def _achievements(self):
+        self.env.flush_all()
+        return {line.id: line.achieved_percentage for line in self.performances.performance_line_ids}
+
+    def test_checked_then_sibling_edit(self):
+        Aggregation = self.env['performance.aggregation']
+        for employee, rating in ((self.employee_a, 2.0), (self.employee_b, 4.0), (self.employee_c, 3.0)):
+            self._rate(employee, rating)
+        Aggregation.aggregate_subtree(self.top)
+
+        # A change the incremental rollup missed, caught up by pressing Checked on the manager
+        self._rate(self.employee_a, 5.0, propagate=False)
+        self.performances.filtered(lambda p: p.employee_id == self.manager_1).action_mark_checked()
+        # The sibling's change is applied as a delta on the top employee's totals
+        self._rate(self.employee_c, 1.0)
+        incremental = self._achievements()
+
+        Aggregation.aggregate_subtree(self.top)
+        self.assertEqual(self._achievements(), incremental)
+        top_line = self.performances.filtered(lambda p: p.employee_id == self.top).performance_line_ids
+        # Managers at (100 + 80) / 2 and 20
+        self.assertEqual(top_line.achieved_percentage, 55.0)
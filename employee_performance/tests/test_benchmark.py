@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import random
+import time
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import SQL
+
+from odoo.addons.employee_performance.models.performance import ACHIEVEMENT_FORMULAS
+
+_logger = logging.getLogger(__name__)
+
+# Maximum SQL queries per scenario. Query counts do not depend on the host, so
+# they make stable regression thresholds; wall times are reported only.
+BENCHMARK_THRESHOLDS = {
+    'employee.performance.aggregate_from_children': {'queries': 40},
+    'employee.kpi.aggregate_from_children': {'queries': 40},
+    'performance.aggregation.aggregate_subtree': {'queries': 120},
+    'employee.performance.get_dashboard_data (cold)': {'queries': 20},
+    'employee.performance.get_dashboard_data (warm)': {'queries': 5},
+    'employee.performance.get_dashboard_details': {'queries': 10},
+    'employee.performance._onchange_level_id': {'queries': 15},
+    'employee.kpi._onchange_level_id': {'queries': 15},
+    'employee.performance.line._compute_achieved_percentage': {'queries': 40},
+    'employee.performance.line._recompute_achieved_percentage_bulk': {'queries': 10},
+    'employee.kpi._compute_totals': {'queries': 40},
+    'hr.employee._compute_latest_kpi': {'queries': 40},
+}
+
+# Optional file the results are appended to, one JSON object per scenario
+BENCHMARK_OUTPUT = os.environ.get('EMPLOYEE_PERFORMANCE_BENCHMARK_OUTPUT')
+
+
+@tagged('-standard', '-at_install', 'post_install', 'benchmark')
+class TestPerformanceBenchmark(TransactionCase):
+    """Generate a synthetic org, then time and query-count the module's hot paths.
+
+    Fails when a scenario exceeds its query threshold. Not part of the
+    standard run: select it with --test-tags benchmark. Each scenario's
+    result is logged as a JSON object, and appended to the file named by
+    EMPLOYEE_PERFORMANCE_BENCHMARK_OUTPUT when set, for CI to compare runs.
+    """
+
+    employees = 10000
+    depth = 8
+    fanout = (5, 20)
+    objectives = 7
+    seed = 42
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.org = cls._generate_org(cls.employees, cls.depth, cls.fanout, cls.objectives, cls.seed)
+
+    def test_thresholds(self):
+        # Scenarios run in order on the same org, as some of them change it
+        results = []
+        for name, func in self._scenarios(self.org):
+            result = self._measure(name, func)
+            results.append(result)
+            _logger.info("Benchmark result: %s", json.dumps(result))
+            for metric, limit in BENCHMARK_THRESHOLDS.get(name, {}).items():
+                with self.subTest(scenario=name, metric=metric):
+                    self.assertLessEqual(result[metric], limit, f"{name}: {metric} above the threshold")
+        if BENCHMARK_OUTPUT:
+            with open(BENCHMARK_OUTPUT, 'a', encoding='utf-8') as output:
+                output.writelines(json.dumps(result) + '\n' for result in results)
+
+    def _measure(self, name, func):
+        """Run func on a cold cache and return its wall time, query count and record count"""
+        cr = self.env.cr
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        records = func()
+        self.env.flush_all()
+        return {
+            'name': name,
+            'wall_ms': round((time.perf_counter() - start) * 1000, 1),
+            'queries': cr.sql_log_count - queries,
+            'records': records,
+        }
+
+    @classmethod
+    def _generate_org(cls, employees, depth, fanout, objectives, seed):
+        """Create the synthetic org: employees, objectives, one level per depth and a review cycle"""
+        rng = random.Random(seed)
+        env = cls.env
+        Employee = env['hr.employee']
+
+        # Only a share of each level manages a team, so the tree reaches the
+        # requested depth with the requested fan-out
+        growth = employees ** (1.0 / depth)
+        manager_ratio = min(1.0, growth / (sum(fanout) / 2.0))
+        levels = [Employee.create({'name': 'Benchmark Employee 0'})]
+        total = 1
+        while len(levels) < depth and total < employees:
+            managers = [emp for emp in levels[-1] if rng.random() < manager_ratio] or levels[-1][:1]
+            vals_list = []
+            for manager in managers:
+                for _i in range(rng.randint(*fanout)):
+                    if total + len(vals_list) < employees:
+                        vals_list.append({'name': f"Benchmark Employee {total + len(vals_list)}",
+                                          'parent_id': manager.id})
+            levels.append(Employee.create(vals_list))
+            total += len(levels[-1])
+        if total < employees:
+            # Attach the remainder above the deepest level to keep the depth
+            parents = [(d, emp) for d, level in enumerate(levels[:-1]) for emp in level]
+            placements = [rng.choice(parents) for _i in range(total, employees)]
+            extra = Employee.create([{
+                'name': f"Benchmark Employee {total + i}",
+                'parent_id': parent.id,
+            } for i, (_d, parent) in enumerate(placements)])
+            for (d, _parent), emp in zip(placements, extra):
+                levels[d + 1] |= emp
+
+        flags = list(ACHIEVEMENT_FORMULAS)
+        objective_records = env['performance.objective'].create([{
+            'name': f"Benchmark Objective {i}",
+            flags[i % len(flags)]: True,
+        } for i in range(objectives)])
+        performance_levels = env['performance.level'].create([{
+            'name': f"Benchmark Level {d}",
+            'objective_line_ids': [(0, 0, {'objective_id': objective.id, 'target_percentage': 100.0})
+                                   for objective in objective_records],
+        } for d in range(len(levels))])
+        for level, level_employees in zip(performance_levels, levels):
+            level._open_review_cycle(level_employees)
+
+        cls._randomize_lines(rng, Employee.browse([emp.id for level in levels for emp in level]))
+        return {'levels': levels, 'performance_levels': performance_levels}
+
+    @classmethod
+    def _randomize_lines(cls, rng, employees):
+        """Fill counters and ratings with random values, in bulk"""
+        cr = cls.env.cr
+        cls.env.flush_all()
+        cr.execute(SQL(
+            """
+            UPDATE employee_performance_line l
+               SET number_of_wo = 50 + floor(random() * 50),
+                   number_of_job_completed = floor(random() * 50),
+                   number_of_job_fixed_single_visit = floor(random() * 50),
+                   number_of_job_scheduled = 20 + floor(random() * 20),
+                   number_of_job_attend = floor(random() * 20),
+                   number_of_job_submitted = floor(random() * 40),
+                   number_of_job_opportunities = 100,
+                   number_of_incidents = floor(random() * 10),
+                   achieve_rating = round((random() * 5)::numeric, 1),
+                   previous_year_revenue = 1000000,
+                   current_year_revenue = 900000 + floor(random() * 300000)
+              FROM employee_performance p
+             WHERE p.id = l.performance_id AND p.employee_id = ANY(%s)
+            """,
+            employees.ids,
+        ))
+        cls.env.invalidate_all()
+        cls.env['employee.performance.line']._recompute_achieved_percentage_bulk()
+
+        cr.execute(SQL(
+            """
+            UPDATE employee_kpi_line l SET achieved_percentage = round((random() * 120)::numeric, 2)
+              FROM employee_kpi k
+             WHERE k.id = l.kpi_id AND k.employee_id = ANY(%s)
+            """,
+            employees.ids,
+        ))
+        cls.env.invalidate_all()
+        # Weightage and rating feed stored computes: write them through the ORM, grouped by value
+        kpi_lines = cls.env['employee.kpi.line'].search([('kpi_id.employee_id', 'in', employees.ids)])
+        groups = {}
+        for line in kpi_lines:
+            groups.setdefault((rng.choice((10.0, 15.0, 20.0)), float(rng.randint(1, 5))), []).append(line.id)
+        for (weightage, rating), line_ids in groups.items():
+            kpi_lines.browse(line_ids).write({'weightage': weightage, 'rating': rating})
+
+    def _scenarios(self, org):
+        """(name, callable) pairs; each callable returns the number of records it handled"""
+        env = self.env
+        levels = org['levels']
+        root = levels[0]
+        middle = levels[len(levels) // 2]
+        leaf = levels[-1][:1]
+        level = org['performance_levels'][-1]
+        Line = env['employee.performance.line']
+
+        def aggregate_records(model_name):
+            records = env[model_name].search([('employee_id', 'in', middle.ids)], limit=500)
+            records.aggregate_from_children()
+            return len(records)
+
+        def aggregate_subtree():
+            # What the background job of action_aggregate_subordinates does, without its commits
+            env['performance.aggregation'].aggregate_subtree(root)
+            return sum(len(level) for level in levels)
+
+        def dashboard(cold):
+            if cold:
+                env['performance.dashboard.snapshot'].sudo().search([]).unlink()
+            env['employee.performance'].get_dashboard_data()
+            return 1
+
+        def dashboard_details():
+            return len(env['employee.performance'].get_dashboard_details(
+                offset=100, limit=50, order='overall_rating')['records'])
+
+        def onchange(model_name, lines_field):
+            record = env[model_name].new({'employee_id': leaf.id})
+            record.level_id = level
+            record._onchange_level_id()
+            return len(record[lines_field])
+
+        def recompute(model_name, fname, domain, limit=20000):
+            records = env[model_name].search(domain, limit=limit)
+            env.add_to_compute(records._fields[fname], records)
+            return len(records)
+
+        def bulk_recompute():
+            return Line._recompute_achieved_percentage_bulk()
+
+        return [
+            ('employee.performance.aggregate_from_children', lambda: aggregate_records('employee.performance')),
+            ('employee.kpi.aggregate_from_children', lambda: aggregate_records('employee.kpi')),
+            ('performance.aggregation.aggregate_subtree', aggregate_subtree),
+            ('employee.performance.get_dashboard_data (cold)', lambda: dashboard(cold=True)),
+            ('employee.performance.get_dashboard_data (warm)', lambda: dashboard(cold=False)),
+            ('employee.performance.get_dashboard_details', dashboard_details),
+            ('employee.performance._onchange_level_id', lambda: onchange('employee.performance', 'performance_line_ids')),
+            ('employee.kpi._onchange_level_id', lambda: onchange('employee.kpi', 'kpi_line_ids')),
+            ('employee.performance.line._compute_achieved_percentage',
+             lambda: recompute('employee.performance.line', 'achieved_percentage', [])),
+            ('employee.performance.line._recompute_achieved_percentage_bulk', bulk_recompute),
+            ('employee.kpi._compute_totals', lambda: recompute('employee.kpi', 'overall_rating', [])),
+            ('hr.employee._compute_latest_kpi',
+             lambda: recompute('hr.employee', 'latest_kpi_id', [('kpi_ids', '!=', False)])),
+        ]
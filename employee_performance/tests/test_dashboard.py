@@ -0,0 +1,69 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestDashboardQueries(TransactionCase):
+    """The dashboard is served from grouped aggregates: its query count must not grow with the data"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        objectives = cls.env['performance.objective'].create([
+            {'name': 'Jobs Completed', 'show_job_completed': True},
+            {'name': 'Quality Score', 'show_quality_score': True},
+        ])
+        cls.levels = cls.env['performance.level'].create([{
+            'name': name,
+            'objective_line_ids': [(0, 0, {'objective_id': objective.id, 'target_percentage': 100.0})
+                                   for objective in objectives],
+        } for name in ('Company Level', 'TST Individual')])
+        cls.employee_count = 0
+
+    def _add_employees(self, count):
+        """Create count employees with a performance and a KPI record per level"""
+        employees = self.env['hr.employee'].create([
+            {'name': f"Dashboard Employee {self.employee_count + i}"} for i in range(count)
+        ])
+        self.employee_count += count
+        for level in self.levels:
+            level._open_review_cycle(employees)
+
+    def _assert_constant_queries(self, func, expected):
+        """Run func on a cold record cache at two dataset sizes, with at most expected queries each time"""
+        counts = []
+        for size in (5, 50):
+            self._add_employees(size)
+            # Run the precommit hooks of the data changes now, not when
+            # assertQueryCount flushes, right before the measured call
+            self.env.cr.flush()
+            # Warm the ormcaches (config parameters), which are not data dependent
+            func()
+            self.env.flush_all()
+            self.env.invalidate_all()
+            queries = self.cr.sql_log_count
+            with self.assertQueryCount(expected):
+                func()
+            counts.append(self.cr.sql_log_count - queries)
+        self.assertEqual(counts[0], counts[1], "The query count grows with the number of records")
+
+    def test_dashboard_data(self):
+        self._assert_constant_queries(self.env['employee.performance']._compute_dashboard_data, 10)
+
+    def test_dashboard_cards(self):
+        Performance = self.env['employee.performance']
+        self._assert_constant_queries(Performance._compute_dashboard_levels, 2)
+        self._assert_constant_queries(Performance._compute_dashboard_ratings, 2)
+        self._assert_constant_queries(Performance._compute_dashboard_summary, 2)
+
+    def test_dashboard_details(self):
+        Performance = self.env['employee.performance']
+        self._assert_constant_queries(
+            lambda: Performance.get_dashboard_details(offset=2, limit=5, order='overall_rating'), 5)
+
+    def test_dashboard_snapshots(self):
+        """Served from the snapshots, the card endpoints only read the snapshot"""
+        Performance = self.env['employee.performance']
+        for endpoint in (Performance.get_dashboard_levels, Performance.get_dashboard_ratings,
+                         Performance.get_dashboard_summary, Performance.get_dashboard_data):
+            self._assert_constant_queries(endpoint, 3)
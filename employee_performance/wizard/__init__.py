@@ -0,0 +1 @@
+from . import review_cycle_wizard
@@ -0,0 +1,34 @@
+from odoo import models, fields, api
+
+
+class PerformanceReviewCycleWizard(models.TransientModel):
+    _name = 'performance.review.cycle.wizard'
+    _description = 'Open Review Cycle'
+
+    level_id = fields.Many2one('performance.level', string='Level Template', required=True)
+    employee_ids = fields.Many2many('hr.employee', string='Employees', default=lambda self: self._default_employee_ids())
+    create_performance = fields.Boolean(string='Create Performance Records', default=True)
+    create_kpi = fields.Boolean(string='Create KPI Records', default=True)
+
+    @api.model
+    def _default_employee_ids(self):
+        if self.env.context.get('active_model') == 'hr.employee':
+            return self.env.context.get('active_ids', [])
+        return []
+
+    def action_open_cycle(self):
+        """Generate the cycle's performance and KPI records for all selected employees"""
+        self.ensure_one()
+        performances, kpis = self.level_id._open_review_cycle(
+            self.employee_ids, performance=self.create_performance, kpi=self.create_kpi)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Review Cycle Opened',
+                'message': f"{len(performances)} performance and {len(kpis)} KPI records created.",
+                'type': 'success',
+                'sticky': False,
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }